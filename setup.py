@@ -34,7 +34,8 @@ setup(
     author="Yammer",
     long_description=readme + '\n\n' + history,
     packages=["yampy", "yampy.apis"],
-    install_requires=["requests"],
+    install_requires=["requests", 'futures; python_version < "3"'],
+    extras_require={"http2": ["httpx[http2]"]},
     license="Apache License (2.0)",
     url="http://github.com/yammer/yam-python",
     classifiers=[
@@ -0,0 +1,80 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+
+from yampy.aggregator import FeedAggregator
+from yampy.apis import MessagesAPI
+
+
+class FakeFeedClient(object):
+    """
+    Serves pages of two messages from fixed message id lists, keyed by path.
+    """
+
+    def __init__(self, feeds):
+        self.feeds = feeds
+        self.requests = []
+
+    def get(self, path, older_than=None, **kwargs):
+        self.requests.append((path, older_than))
+        ids = [i for i in self.feeds[path]
+               if older_than is None or i < older_than][:2]
+        return {
+            "messages": [{"id": i, "created_at": "2019/01/%02d" % i}
+                         for i in ids],
+            "references": [],
+            "meta": {"older_available": len(ids) == 2},
+        }
+
+
+class FeedAggregatorTest(TestCase):
+    def setUp(self):
+        self.client = FakeFeedClient({
+            "/messages/private": [9, 6, 3, 1],
+            "/messages/in_group/5": [8, 6, 2],
+            "/messages/in_group/7": [7, 4],
+        })
+        self.messages_api = MessagesAPI(client=self.client)
+        self.feeds = ["private", ("from_group", 5), ("from_group", {"id": 7})]
+
+    def test_merges_feeds_newest_first_without_duplicates(self):
+        aggregator = FeedAggregator(self.messages_api, self.feeds)
+
+        ids = [message["id"] for message in aggregator]
+
+        self.assertEqual([9, 8, 7, 6, 4, 3, 2, 1], ids)
+
+    def test_can_order_by_created_at(self):
+        aggregator = FeedAggregator(self.messages_api, self.feeds,
+                                    order_by="created_at")
+
+        ids = [message["id"] for message in aggregator.latest(3)]
+
+        self.assertEqual([9, 8, 7], ids)
+
+    def test_latest_does_not_download_full_histories(self):
+        aggregator = FeedAggregator(self.messages_api, ["private"])
+
+        aggregator.latest(1)
+
+        self.assertTrue(("/messages/private", 3) not in self.client.requests)
+
+    def test_rejects_unknown_orderings(self):
+        self.assertRaises(ValueError, FeedAggregator, self.messages_api,
+                          self.feeds, order_by="likes")
@@ -192,3 +192,27 @@ class GroupsAPILeaveTest(TestCaseWithMockClient):
             "/group_memberships",
             group_id=125,
         )
+
+
+class GroupsAPIMembersTest(TestCaseWithMockClient):
+
+    def setUp(self):
+        super(GroupsAPIMembersTest, self).setUp()
+        self.groups_api = GroupsAPI(client=self.mock_client)
+
+    def test_members(self):
+        members = self.groups_api.members({"id": 12}, page=3)
+
+        self.mock_client.get.assert_called_once_with("/users/in_group/12",
+                                                     page=3)
+        self.assertEquals(self.mock_get_response, members)
+
+    def test_iter_members(self):
+        self.mock_client.get.side_effect = lambda path, page=None: {
+            "users": [{"id": page}], "more_available": page < 2,
+        }
+
+        pages = list(self.groups_api.iter_members(12))
+
+        self.assertEqual([[{"id": 1}], [{"id": 2}]],
+                         [page["users"] for page in pages])
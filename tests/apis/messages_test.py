@@ -15,11 +15,17 @@
 # See the Apache Version 2.0 License for specific language governing
 # permissions and limitations under the License.
 
+from datetime import datetime, timedelta
+
 from mock import Mock
 
 from tests.support.unit import TestCaseWithMockClient, TestCase
 from yampy.apis import MessagesAPI
-from yampy.errors import InvalidOpenGraphObjectError, TooManyTopicsError
+from yampy.errors import DeadlineExceededError, \
+                         InvalidOpenGraphObjectError, NotFoundError, \
+                         TooManyTopicsError
+from yampy.multipart import MultipartEncoder
+from yampy.spill import SpilledMessages
 
 
 class MessagesAPIMessageListFetchingTest(TestCase):
@@ -360,3 +366,264 @@ class MessagesAPIEmailTest(TestCaseWithMockClient):
             "/messages/email",
             message_id=7,
         )
+
+
+class MessagesAPIBulkTest(TestCaseWithMockClient):
+    def setUp(self):
+        super(MessagesAPIBulkTest, self).setUp()
+        self.messages_api = MessagesAPI(client=self.mock_client)
+
+    def test_delete_many(self):
+        report = self.messages_api.delete_many([1, {"id": 2}])
+
+        self.mock_client.delete.assert_any_call("/messages/1")
+        self.mock_client.delete.assert_any_call("/messages/2")
+        self.assertEqual([1, 2], sorted(report.succeeded))
+
+    def test_delete_many_treats_missing_messages_as_deleted(self):
+        self.mock_client.delete.side_effect = NotFoundError("")
+
+        report = self.messages_api.delete_many([3])
+
+        self.assertTrue(report.ok)
+
+    def test_like_many_reports_missing_messages(self):
+        self.mock_client.post.side_effect = NotFoundError("")
+
+        report = self.messages_api.like_many([3])
+
+        self.assertEqual([3], list(report.failed))
+
+    def test_unlike_many(self):
+        self.messages_api.unlike_many([5])
+
+        self.mock_client.delete.assert_called_once_with(
+            "/messages/liked_by/current",
+            message_id=5,
+        )
+
+    def test_email_many(self):
+        self.messages_api.email_many([6])
+
+        self.mock_client.post.assert_called_once_with(
+            "/messages/email",
+            message_id=6,
+        )
+
+
+class MessagesAPIIterationTest(TestCaseWithMockClient):
+    def setUp(self):
+        super(MessagesAPIIterationTest, self).setUp()
+        self.messages_api = MessagesAPI(client=self.mock_client)
+        self.mock_client.get.side_effect = [
+            {"messages": [{"id": 9}, {"id": 8}],
+             "meta": {"older_available": True}},
+            {"messages": [{"id": 7}],
+             "meta": {"older_available": False}},
+        ]
+
+    def test_iter_pages_follows_the_older_than_cursor(self):
+        pages = list(self.messages_api.iter_pages("from_group", {"id": 4}))
+
+        self.assertEqual(2, len(pages))
+        self.mock_client.get.assert_called_with(
+            "/messages/in_group/4",
+            older_than=8,
+        )
+
+    def test_iter_messages(self):
+        messages = self.messages_api.iter_messages("private", limit=2)
+
+        self.assertEqual([9, 8, 7], [message["id"] for message in messages])
+
+    def test_iter_pages_rejects_unknown_feeds(self):
+        self.assertRaises(ValueError, self.messages_api.iter_pages, "nope")
+
+    def test_iter_pages_with_prefetch(self):
+        pages = list(self.messages_api.iter_pages("all", prefetch=2))
+
+        self.assertEqual([[9, 8], [7]],
+                         [[m["id"] for m in page["messages"]]
+                          for page in pages])
+
+
+class MessagesAPIStreamingCreateTest(TestCaseWithMockClient):
+    def setUp(self):
+        super(MessagesAPIStreamingCreateTest, self).setUp()
+        self.messages_api = MessagesAPI(client=self.mock_client)
+
+    def test_create_can_stream_files(self):
+        self.messages_api.create(body="Attached",
+                                 files={"attachment1": b"data"},
+                                 stream_files=True)
+
+        files = self.mock_client.post.call_args[1]["files"]
+        self.assertIsInstance(files, MultipartEncoder)
+
+    def test_create_without_files_does_not_stream(self):
+        self.messages_api.create(body="Hello", stream_files=True)
+
+        self.mock_client.post.assert_called_once_with(
+            "/messages",
+            files=None,
+            body="Hello",
+        )
+
+    def test_create_many_reports_by_index(self):
+        progress = Mock()
+
+        def post(path, files=None, **kwargs):
+            files.read()
+            return kwargs["body"]
+        self.mock_client.post.side_effect = post
+
+        report = self.messages_api.create_many([
+            {"body": "First", "files": {"attachment1": b"one"}},
+            {"body": "Second", "files": {"attachment1": b"two"}},
+        ], progress=progress)
+
+        self.assertEqual({0: "First", 1: "Second"}, report.succeeded)
+        self.assertEqual([0, 1], sorted(set(
+            call[0][0] for call in progress.call_args_list)))
+
+
+class MessagesAPIProjectionTest(TestCaseWithMockClient):
+    def test_with_fields_passes_a_projection_to_the_client(self):
+        messages_api = MessagesAPI(client=self.mock_client)
+        sink = Mock()
+        messages_api.add_sink(sink)
+
+        projected = messages_api.with_fields("sender_id", "body.plain")
+        projected.find(3)
+
+        projection = self.mock_client.get.call_args[1]["projection"]
+        self.assertEqual(("body.plain", "id", "sender_id"), projection.paths)
+        projected.all()
+        sink.assert_called_with(self.mock_get_response)
+
+
+class MessagesAPINewestMessageTest(TestCaseWithMockClient):
+    def setUp(self):
+        super(MessagesAPINewestMessageTest, self).setUp()
+        self.messages_api = MessagesAPI(client=self.mock_client)
+
+    def test_newest_message(self):
+        self.mock_client.get.return_value = {"messages": [{"id": 41}]}
+
+        message = self.messages_api.newest_message("sent", older_than=42)
+
+        self.mock_client.get.assert_called_once_with(
+            "/messages/sent",
+            older_than=42,
+            limit=1,
+        )
+        self.assertEqual({"id": 41}, message)
+
+    def test_newest_message_of_an_empty_feed(self):
+        self.mock_client.get.return_value = {"messages": []}
+
+        self.assertEqual(None, self.messages_api.newest_message("all"))
+
+
+class FakeFeedClient(object):
+    """
+    Serves a feed with one message per day: message ``n`` is created on day
+    ``n`` of 2019, and ids go up in steps of ten.
+    """
+
+    def __init__(self, days):
+        self.days = days
+        self.requests = 0
+
+    def get(self, path, older_than=None, limit=20, **kwargs):
+        self.requests += 1
+        ids = [day * 10 for day in sorted(self.days, reverse=True)
+               if older_than is None or day * 10 < older_than][:limit]
+        return {
+            "messages": [{"id": i, "created_at": self.created_at(i // 10)}
+                         for i in ids],
+            "meta": {"older_available": len(ids) == limit},
+        }
+
+    def created_at(self, day):
+        date = datetime(2019, 1, 1) + timedelta(days=day - 1)
+        return date.strftime("%Y/%m/%d %H:%M:%S +0000")
+
+
+class MessagesAPIDeadlineTest(TestCase):
+    def test_paging_keeps_the_pages_fetched_before_the_deadline(self):
+        client = FakeFeedClient(range(1, 51))
+        get = client.get
+
+        def get_until_deadline(*args, **kwargs):
+            if client.requests == 2:
+                raise DeadlineExceededError("Deadline exceeded")
+            return dict(get(*args, **kwargs), references=[])
+        client.get = get_until_deadline
+        messages_api = MessagesAPI(client=client)
+
+        try:
+            messages_api.all(limit=20)
+            self.fail("DeadlineExceededError not raised")
+        except DeadlineExceededError as e:
+            self.assertEqual(40, len(e.partial_result["messages"]))
+
+
+class MessagesAPISpillTest(TestCase):
+    def setUp(self):
+        client = FakeFeedClient(range(1, 51))
+        get = client.get
+        client.get = lambda *args, **kwargs: dict(get(*args, **kwargs),
+                                                  references=[])
+        self.messages_api = MessagesAPI(client=client)
+
+    def test_large_results_are_spilled_to_disk(self):
+        expected = self.messages_api.all(limit=20)
+
+        result = self.messages_api.with_spill(max_memory=500).all(limit=20)
+        self.addCleanup(result.messages.close)
+
+        self.assertIsInstance(result.messages, SpilledMessages)
+        self.assertEqual([m["id"] for m in expected.messages],
+                         [m.id for m in result.messages])
+
+    def test_spilling_can_be_combined_with_projections(self):
+        messages_api = self.messages_api.with_spill(max_memory=500) \
+            .with_fields("created_at")
+
+        result = messages_api.all(limit=20)
+        self.addCleanup(result.messages.close)
+
+        self.assertIsInstance(result.messages, SpilledMessages)
+
+
+class MessagesAPISeekTest(TestCase):
+    def setUp(self):
+        self.client = FakeFeedClient(range(1, 301))
+        self.messages_api = MessagesAPI(client=self.client)
+
+    def test_seek_finds_the_first_message_before_the_date(self):
+        older_than = self.messages_api.seek("all", datetime(2019, 2, 1))
+
+        self.assertTrue(310 < older_than <= 320)
+        self.assertTrue(self.client.requests < 40)
+
+    def test_seek_when_every_message_is_older(self):
+        self.assertEqual(None,
+                         self.messages_api.seek("all", datetime(2020, 1, 1)))
+
+    def test_seek_when_no_message_is_older(self):
+        older_than = self.messages_api.seek("all", datetime(2018, 1, 1))
+
+        self.assertEqual([], list(self.messages_api.iter_messages(
+            "all", older_than=older_than)))
+
+    def test_iter_created_between(self):
+        messages = self.messages_api.iter_created_between(
+            "all",
+            created_after=datetime(2019, 1, 29),
+            created_before=datetime(2019, 2, 1),
+            limit=2,
+        )
+
+        self.assertEqual([310, 300, 290], [m["id"] for m in messages])
@@ -15,7 +15,7 @@
 # See the Apache Version 2.0 License for specific language governing
 # permissions and limitations under the License.
 
-from mock import Mock
+from mock import ANY, Mock
 
 from tests.support.unit import TestCaseWithMockClient
 from yampy.apis import UsersAPI
@@ -494,3 +494,42 @@ class UsersAPISuspendAndDeleteTest(TestCaseWithMockClient):
             delete="true",
         )
         self.assertEquals(self.mock_delete_response, delete_result)
+
+
+class UsersAPIIterationTest(TestCaseWithMockClient):
+    def setUp(self):
+        super(UsersAPIIterationTest, self).setUp()
+        self.users_api = UsersAPI(client=self.mock_client)
+
+    def test_iter_all(self):
+        pages = {1: [{"id": 1}], 2: [{"id": 2}]}
+        self.mock_client.get.side_effect = \
+            lambda path, page=None, **kwargs: pages.get(page, [])
+
+        result = list(self.users_api.iter_all(sort_by="messages"))
+
+        self.assertEqual([[{"id": 1}], [{"id": 2}]], result)
+        self.mock_client.get.assert_any_call("/users", page=2,
+                                             sort_by="messages")
+
+    def test_iter_in_group(self):
+        self.mock_client.get.side_effect = lambda path, page=None: {
+            "users": [{"id": page}], "more_available": False,
+        }
+
+        result = list(self.users_api.iter_in_group(7))
+
+        self.assertEqual(1, len(result))
+        self.mock_client.get.assert_any_call("/users/in_group/7", page=1)
+
+
+class UsersAPIProjectionTest(TestCaseWithMockClient):
+    def test_with_fields_passes_a_projection_to_the_client(self):
+        users_api = UsersAPI(client=self.mock_client).with_fields("full_name")
+
+        users_api.find(13)
+
+        self.mock_client.get.assert_called_once_with(
+            "/users/13", projection=ANY)
+        projection = self.mock_client.get.call_args[1]["projection"]
+        self.assertEqual(("full_name", "id"), projection.paths)
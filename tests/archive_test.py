@@ -0,0 +1,118 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import Mock
+
+from yampy.apis import MessagesAPI
+from yampy.archive import MessageArchiveReader, MessageArchiveWriter, \
+    index_path
+
+
+def message(message_id, thread_id, created_at):
+    return {
+        "id": message_id,
+        "thread_id": thread_id,
+        "created_at": created_at,
+        "body": {"plain": "Message %d" % message_id},
+    }
+
+
+class MessageArchiveTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "history.jsonl.gz")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_pages(self, *pages):
+        with MessageArchiveWriter(self.path) as archive:
+            for page in pages:
+                archive.write_page(page)
+
+    def test_find_returns_generic_models(self):
+        self.write_pages(
+            {"messages": [message(3, 1, "2019/01/03"),
+                          message(2, 2, "2019/01/02")],
+             "references": [{"type": "user", "id": 7}]},
+            {"messages": [message(1, 1, "2019/01/01")], "references": []},
+        )
+
+        with MessageArchiveReader(self.path) as reader:
+            self.assertEqual(3, len(reader))
+            self.assertEqual("Message 2", reader.find(2).body.plain)
+            self.assertEqual("Message 1", reader.find({"id": 1}).body.plain)
+            self.assertIsNone(reader.find(99))
+            self.assertEqual([{"type": "user", "id": 7}],
+                             list(reader.references()))
+
+    def test_in_thread_spans_frames(self):
+        self.write_pages(
+            {"messages": [message(3, 1, "2019/01/03"),
+                          message(2, 2, "2019/01/02")]},
+            {"messages": [message(1, 1, "2019/01/01")]},
+        )
+
+        with MessageArchiveReader(self.path) as reader:
+            self.assertEqual([3, 1], [m.id for m in reader.in_thread(1)])
+
+    def test_created_between(self):
+        self.write_pages(
+            {"messages": [message(3, 1, "2019/01/03"),
+                          message(2, 2, "2019/01/02")]},
+            {"messages": [message(1, 1, "2019/01/01")]},
+        )
+
+        with MessageArchiveReader(self.path) as reader:
+            messages = reader.created_between("2019/01/02", "2019/01/04")
+            self.assertEqual([2, 3], [m.id for m in messages])
+
+    def test_appending_skips_archived_messages(self):
+        self.write_pages({"messages": [message(1, 1, "2019/01/01")]})
+        self.write_pages({"messages": [message(1, 1, "2019/01/01"),
+                                       message(2, 1, "2019/01/02")]})
+
+        with MessageArchiveReader(self.path) as reader:
+            self.assertEqual([1, 2], sorted(m.id for m in reader))
+
+    def test_reader_requires_an_index(self):
+        self.write_pages({"messages": [message(1, 1, "2019/01/01")]})
+        os.remove(index_path(self.path))
+
+        self.assertRaises(ValueError, MessageArchiveReader, self.path)
+
+    def test_writer_as_a_messages_api_sink(self):
+        client = Mock()
+        client.get.return_value = {
+            "messages": [message(5, 5, "2019/01/05")],
+            "references": [],
+        }
+        messages_api = MessagesAPI(client=client)
+
+        with MessageArchiveWriter(self.path) as archive:
+            messages_api.add_sink(archive.write_page)
+            messages_api.all()
+            messages_api.remove_sink(archive.write_page)
+
+        with MessageArchiveReader(self.path) as reader:
+            self.assertEqual(5, reader.find(5).id)
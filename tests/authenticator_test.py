@@ -23,6 +23,9 @@ try:
 except ImportError:
     from urllib.parse import urlparse, parse_qs # Python 3
 
+from mock import ANY, Mock
+import requests
+
 from .support.unit import HTTPHelpers
 from yampy import Authenticator
 from yampy.errors import *
@@ -169,3 +172,76 @@ class AuthenticatorFetchAccessTokenTest(HTTPHelpers, TestCase):
                 "view_messages": true
             }
         }"""
+
+
+class AuthenticatorTokenCacheTest(HTTPHelpers, TestCase):
+    def test_repeated_exchanges_of_a_code_are_cached(self):
+        self.stub_get_requests(response_body=self.valid_response_json)
+        authenticator = Authenticator(client_id="foo", client_secret="bar")
+
+        first = authenticator.fetch_access_token("my-code")
+        second = authenticator.fetch_access_token("my-code")
+
+        self.assertEqual("abc123", first)
+        self.assertEqual("abc123", second)
+        self.assertEqual(1, requests.request.call_count)
+
+    def test_exchanged_tokens_are_mapped_to_their_users(self):
+        self.stub_get_requests(response_body=self.valid_response_json)
+        authenticator = Authenticator(client_id="foo", client_secret="bar")
+        authenticator.fetch_access_data("my-code")
+
+        user = authenticator.user_for_token("abc123")
+
+        self.assertEqual("Joe Bloggs", user.full_name)
+        self.assertTrue(authenticator.is_valid_token("abc123"))
+        self.assertEqual(1, requests.request.call_count)
+
+    def test_user_for_token_fetches_the_current_user(self):
+        self.stub_get_requests(response_body='{"id": 7}')
+        authenticator = Authenticator(client_id="foo", client_secret="bar")
+
+        self.assertEqual(7, authenticator.user_for_token("xyz").id)
+        self.assertEqual(7, authenticator.user_for_token("xyz").id)
+
+        self.assert_get_request(
+            url="https://www.yammer.com/api/v1/users/current.json",
+            headers={"Authorization": "Bearer xyz"},
+        )
+        self.assertEqual(1, requests.request.call_count)
+
+    def test_invalid_tokens_are_cached(self):
+        self.stub_get_requests(response_status=401)
+        authenticator = Authenticator(client_id="foo", client_secret="bar")
+
+        self.assertFalse(authenticator.is_valid_token("expired"))
+        self.assertFalse(authenticator.is_valid_token("expired"))
+        self.assertEqual(1, requests.request.call_count)
+
+    def test_forget_token(self):
+        self.stub_get_requests(response_body='{"id": 7}')
+        authenticator = Authenticator(client_id="foo", client_secret="bar")
+        authenticator.user_for_token("xyz")
+
+        authenticator.forget_token("xyz")
+        authenticator.user_for_token("xyz")
+
+        self.assertEqual(2, requests.request.call_count)
+
+    def test_custom_token_stores(self):
+        self.stub_get_requests(response_body=self.valid_response_json)
+        token_store = Mock()
+        token_store.get.return_value = None
+        authenticator = Authenticator(client_id="foo", client_secret="bar",
+                                      token_store=token_store, token_ttl=60)
+
+        authenticator.fetch_access_data("my-code")
+
+        token_store.set.assert_any_call("code:my-code", ANY, 60)
+
+    @property
+    def valid_response_json(self):
+        return json.dumps({
+            "user": {"full_name": "Joe Bloggs"},
+            "access_token": {"token": "abc123"},
+        })
@@ -0,0 +1,125 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+from mock import Mock
+
+from yampy.circuit_breaker import CircuitBreaker
+from yampy.errors import CircuitOpenError, ResponseError
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status_code=200):
+    return Mock(status_code=status_code)
+
+
+def failing():
+    raise IOError("timed out")
+
+
+class CircuitBreakerTest(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30,
+                                      clock=self.clock)
+
+    def fail(self, template="/users/:id"):
+        self.assertRaises(IOError, self.breaker.call, template, failing)
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail()
+        self.assertEqual("closed", self.breaker.state("/users/:id"))
+        self.fail()
+
+        self.assertEqual("open", self.breaker.state("/users/:id"))
+        self.assertRaises(CircuitOpenError, self.breaker.call, "/users/:id",
+                          response)
+        self.assertTrue(issubclass(CircuitOpenError, ResponseError))
+
+    def test_circuits_are_per_template(self):
+        self.fail()
+        self.fail()
+
+        self.assertEqual(200, self.breaker.call("/messages/:id",
+                                                response).status_code)
+
+    def test_successes_reset_the_failure_count(self):
+        self.fail()
+        self.breaker.call("/users/:id", response)
+        self.fail()
+
+        self.assertEqual("closed", self.breaker.state("/users/:id"))
+
+    def test_server_errors_and_slow_responses_count_as_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, slow_threshold=1,
+                                 clock=self.clock)
+        breaker.call("/users/:id", lambda: response(503))
+
+        def slow():
+            self.clock.now += 2
+            return response()
+        breaker.call("/users/:id", slow)
+
+        self.assertEqual("open", breaker.state("/users/:id"))
+        breaker.call("/messages", lambda: response(404))
+        self.assertEqual("closed", breaker.state("/messages"))
+
+    def test_half_open_probe_closes_the_circuit_on_success(self):
+        self.fail()
+        self.fail()
+        self.clock.now = 30
+
+        self.assertEqual("half_open", self.breaker.state("/users/:id"))
+        self.breaker.call("/users/:id", response)
+        self.assertEqual("closed", self.breaker.state("/users/:id"))
+
+    def test_half_open_probe_reopens_the_circuit_on_failure(self):
+        self.fail()
+        self.fail()
+        self.clock.now = 30
+
+        self.fail()
+
+        self.assertEqual("open", self.breaker.state("/users/:id"))
+        self.clock.now = 59
+        self.assertEqual("open", self.breaker.state("/users/:id"))
+
+    def test_metrics(self):
+        self.fail()
+        self.fail()
+        self.assertRaises(CircuitOpenError, self.breaker.call, "/users/:id",
+                          response)
+
+        self.assertEqual({
+            "/users/:id": {
+                "state": "open",
+                "consecutive_failures": 2,
+                "opened": 1,
+                "rejected": 1,
+            },
+        }, self.breaker.metrics())
+
+        self.breaker.reset()
+        self.assertEqual({}, self.breaker.metrics())
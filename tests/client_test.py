@@ -17,9 +17,17 @@
 
 from unittest import TestCase
 
+from mock import Mock
+import requests
+
 from .support.unit import HTTPHelpers
 from yampy import Client
+from yampy.circuit_breaker import CircuitBreaker
+from yampy.deadline import deadline
+from yampy.models import CompactModel, Projection
+from yampy.scheduler import priority
 from yampy.errors import *
+from yampy.multipart import MultipartEncoder
 
 
 class ClientGetTest(HTTPHelpers, TestCase):
@@ -120,6 +128,91 @@ class ClientGetTest(HTTPHelpers, TestCase):
 
         self.assertRaises(ResponseError, client.get, "/messages")
 
+    def test_get_acquires_from_the_rate_limiter(self):
+        self.stub_get_requests()
+        rate_limiter = Mock()
+        client = Client(access_token="abc123", rate_limiter=rate_limiter)
+
+        client.get("/messages")
+
+        rate_limiter.acquire.assert_called_once_with()
+
+    def test_get_is_sent_through_the_hedging_policy(self):
+        self.stub_get_requests(response_body='{"id": 7}')
+        hedging = Mock()
+        hedging.call.side_effect = lambda template, send, send_hedge: send()
+        client = Client(access_token="abc123", hedging=hedging)
+
+        self.assertEqual(7, client.get("/users/7").id)
+        self.assertEqual("/users/:id", hedging.call.call_args[0][0])
+
+    def test_get_sends_timeouts(self):
+        self.stub_get_requests()
+        client = Client(access_token="abc123", timeout=(3, 30))
+
+        client.get("/messages")
+        self.assertEqual((3, 30), requests.request.call_args[1]["timeout"])
+
+        client.get("/messages", timeout=5)
+        self.assertEqual(5, requests.request.call_args[1]["timeout"])
+        self.assertNotIn("timeout", requests.request.call_args[1]["params"])
+
+    def test_get_shortens_timeouts_to_the_deadline(self):
+        self.stub_get_requests()
+        client = Client(access_token="abc123", timeout=30)
+
+        with deadline(2):
+            client.get("/messages")
+
+        self.assertTrue(requests.request.call_args[1]["timeout"] <= 2)
+
+    def test_get_raises_without_a_request_once_the_deadline_has_passed(self):
+        self.stub_get_requests()
+        client = Client(access_token="abc123")
+
+        with deadline(0):
+            self.assertRaises(DeadlineExceededError, client.get, "/messages")
+        self.assertEqual(0, requests.request.call_count)
+
+    def test_get_parses_with_a_projection(self):
+        self.stub_get_requests(
+            response_body='{"id": 3, "full_name": "Joe", "stats": {}}')
+        client = Client(access_token="abc123")
+
+        user = client.get("/users/3", projection=Projection(["full_name"]))
+
+        self.assertEqual({"id": 3, "full_name": "Joe"}, user)
+        self.assertNotIn("projection", requests.request.call_args[1]["params"])
+
+    def test_get_parses_compact_models(self):
+        self.stub_get_requests(response_body='{"messages": [{"id": 3}]}')
+        client = Client(access_token="abc123", compact_models=True)
+
+        page = client.get("/messages")
+
+        self.assertIsInstance(page.messages[0], CompactModel)
+
+    def test_get_waits_for_a_scheduler_slot(self):
+        self.stub_get_requests()
+        scheduler = Mock()
+        client = Client(access_token="abc123", scheduler=scheduler)
+
+        with priority("batch"):
+            client.get("/messages")
+
+        scheduler.acquire.assert_called_once_with("batch", timeout=None)
+        scheduler.release.assert_called_once_with()
+
+    def test_get_fails_fast_when_the_circuit_is_open(self):
+        self.stub_get_requests(response_status=503)
+        breaker = CircuitBreaker(failure_threshold=2)
+        client = Client(access_token="abc123", circuit_breaker=breaker)
+
+        self.assertRaises(ResponseError, client.get, "/users/1")
+        self.assertRaises(ResponseError, client.get, "/users/2")
+        self.assertRaises(CircuitOpenError, client.get, "/users/3")
+        self.assertEqual(2, requests.request.call_count)
+
 
 class ClientPostTest(HTTPHelpers, TestCase):
     def test_post_parses_response_json(self):
@@ -170,6 +263,25 @@ class ClientPostTest(HTTPHelpers, TestCase):
             params={"body": "Oh hai"},
         )
 
+    def test_post_streams_multipart_encoders(self):
+        self.stub_post_requests()
+        client = Client(access_token="abc123")
+        encoder = MultipartEncoder({"attachment1": b"data"})
+
+        client.post("/messages", body="Attached", files=encoder)
+
+        requests.request.assert_called_with(
+            method="post",
+            url="https://www.yammer.com/api/v1/messages.json",
+            params={"body": "Attached"},
+            headers={
+                "Authorization": "Bearer abc123",
+                "Content-Type": encoder.content_type,
+            },
+            proxies=None,
+            data=encoder,
+        )
+
     def test_post_handles_invalid_access_token_responses(self):
         self.stub_post_requests(
             response_status=400,
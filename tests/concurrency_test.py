@@ -0,0 +1,103 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+
+from mock import Mock
+
+from yampy.concurrency import RateLimiter, run_bulk
+from yampy.deadline import deadline
+from yampy.errors import NotFoundError, RateLimitExceededError, ResponseError
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimiterTest(TestCase):
+    def test_allows_a_burst_then_waits_for_tokens(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=2, per=1.0, clock=clock, sleep=clock.sleep)
+
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(0.0, clock.now)
+
+        limiter.acquire()
+        self.assertAlmostEqual(0.5, clock.now)
+
+
+class RunBulkDeadlineTest(TestCase):
+    def test_retries_stop_when_they_would_outlast_the_deadline(self):
+        func = Mock(side_effect=RateLimitExceededError())
+        sleep = Mock()
+
+        with deadline(0.5):
+            report = run_bulk(func, [1], backoff=1.0, sleep=sleep)
+
+        self.assertIsInstance(report.failed[1], RateLimitExceededError)
+        self.assertEqual(1, func.call_count)
+        sleep.assert_not_called()
+
+
+class RunBulkTest(TestCase):
+    def test_reports_results_by_id(self):
+        report = run_bulk(lambda item: item * 2, [1, 2, 3])
+
+        self.assertTrue(report.ok)
+        self.assertEqual({1: 2, 2: 4, 3: 6}, report.succeeded)
+
+    def test_items_are_keyed_by_extracted_id(self):
+        report = run_bulk(lambda item: True, [{"id": 4}, Mock(id=5)])
+
+        self.assertEqual([4, 5], sorted(report.succeeded))
+
+    def test_idempotent_errors_count_as_success(self):
+        def func(item):
+            raise NotFoundError("gone")
+
+        report = run_bulk(func, [1], idempotent_errors=(NotFoundError,))
+
+        self.assertEqual({1: None}, report.succeeded)
+
+    def test_failures_are_reported(self):
+        error = ResponseError("500 error")
+
+        def func(item):
+            raise error
+
+        report = run_bulk(func, [1])
+
+        self.assertFalse(report.ok)
+        self.assertEqual({1: error}, report.failed)
+
+    def test_rate_limited_calls_are_retried(self):
+        func = Mock(side_effect=[RateLimitExceededError(""), "done"])
+        sleep = Mock()
+
+        report = run_bulk(func, [1], backoff=0.5, sleep=sleep)
+
+        self.assertEqual({1: "done"}, report.succeeded)
+        sleep.assert_called_once_with(0.5)
@@ -0,0 +1,81 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+import threading
+
+from yampy.deadline import (Deadline, bind, current_deadline, deadline,
+                            timeout_within_deadline)
+from yampy.errors import DeadlineExceededError
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeadlineTest(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_remaining_and_expiry(self):
+        active = Deadline(5, clock=self.clock)
+        self.clock.now = 2
+        self.assertEqual(3, active.remaining())
+        active.check()
+
+        self.clock.now = 6
+        self.assertEqual(0, active.remaining())
+        self.assertRaises(DeadlineExceededError, active.check)
+
+    def test_deadlines_are_active_within_their_block(self):
+        self.assertEqual(None, current_deadline())
+        with deadline(5, clock=self.clock) as active:
+            self.assertIs(active, current_deadline())
+        self.assertEqual(None, current_deadline())
+
+    def test_nested_deadlines_cannot_extend_the_outer_one(self):
+        with deadline(5, clock=self.clock) as outer:
+            with deadline(10, clock=self.clock) as inner:
+                self.assertIs(outer, inner)
+            with deadline(1, clock=self.clock) as inner:
+                self.assertEqual(1, inner.remaining())
+
+    def test_bind_carries_the_deadline_to_other_threads(self):
+        seen = []
+        with deadline(5, clock=self.clock) as active:
+            thread = threading.Thread(
+                target=bind(lambda: seen.append(current_deadline())))
+            thread.start()
+            thread.join()
+
+        self.assertEqual([active], seen)
+
+    def test_timeouts_are_shortened_to_the_time_left(self):
+        self.assertEqual(30, timeout_within_deadline(30))
+        with deadline(5, clock=self.clock):
+            self.assertEqual(5, timeout_within_deadline(None))
+            self.assertEqual(2, timeout_within_deadline(2))
+            self.assertEqual((3, 5), timeout_within_deadline((3, 60)))
+            self.assertEqual((5, 5), timeout_within_deadline((None, None)))
+            self.clock.now = 5
+            self.assertRaises(DeadlineExceededError,
+                              timeout_within_deadline, 30)
@@ -0,0 +1,100 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+import threading
+
+from yampy.client import path_template
+from yampy.hedging import HedgingPolicy
+
+
+class HedgingPolicyTest(TestCase):
+    def setUp(self):
+        self.policy = HedgingPolicy(percentile=50, min_samples=3, budget=1.0)
+        self.addCleanup(self.policy.shutdown)
+
+    def record(self, *latencies):
+        for latency in latencies:
+            self.policy.record("/users/:id", latency)
+
+    def test_no_delay_until_enough_samples_are_recorded(self):
+        self.record(0.1, 0.2)
+        self.assertEqual(None, self.policy.delay_for("/users/:id"))
+
+        self.record(0.3)
+        self.assertEqual(0.2, self.policy.delay_for("/users/:id"))
+        self.assertEqual(None, self.policy.delay_for("/messages/:id"))
+
+    def test_fast_requests_are_not_hedged(self):
+        self.record(1.0, 1.0, 1.0)
+        calls = []
+
+        def send():
+            calls.append(1)
+            return "response"
+
+        self.assertEqual("response", self.policy.call("/users/:id", send))
+        self.assertEqual(1, len(calls))
+        self.assertEqual(0, self.policy.hedged)
+
+    def test_slow_requests_are_hedged_and_the_first_response_wins(self):
+        self.record(0.01, 0.01, 0.01)
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def slow():
+            released.wait(5)
+            return "slow"
+
+        result = self.policy.call("/users/:id", slow, lambda: "hedge")
+
+        self.assertEqual("hedge", result)
+        self.assertEqual(1, self.policy.hedged)
+
+    def test_a_failed_hedge_falls_back_to_the_first_request(self):
+        self.record(0.01, 0.01, 0.01)
+
+        def slow():
+            threading.Event().wait(0.05)
+            return "slow"
+
+        def failing():
+            raise IOError("connection reset")
+
+        self.assertEqual("slow", self.policy.call("/users/:id", slow, failing))
+
+    def test_the_budget_caps_hedging(self):
+        policy = HedgingPolicy(percentile=50, min_samples=1, budget=0.0)
+        self.addCleanup(policy.shutdown)
+        policy.record("/users/:id", 0.001)
+
+        def slow():
+            threading.Event().wait(0.02)
+            return "slow"
+
+        self.assertEqual("slow", policy.call("/users/:id", slow,
+                                             lambda: "hedge"))
+        self.assertEqual(0, policy.hedged)
+
+
+class PathTemplateTest(TestCase):
+    def test_numeric_segments_are_replaced(self):
+        self.assertEqual("/users/:id", path_template("/users/123"))
+        self.assertEqual("/messages/in_thread/:id",
+                         path_template("/messages/in_thread/4"))
+        self.assertEqual("/users/current", path_template("/users/current"))
@@ -0,0 +1,95 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+
+from yampy.apis import MessagesAPI
+from yampy.history import PartitionedHistory
+
+
+class FakeHistoryClient(object):
+    """
+    Serves a feed of messages with the given ids, in pages of ``limit`` (or
+    three) messages.
+    """
+
+    def __init__(self, ids):
+        self.ids = sorted(ids, reverse=True)
+        self.requests = []
+
+    def get(self, path, older_than=None, limit=3, **kwargs):
+        self.requests.append(older_than)
+        ids = [i for i in self.ids
+               if older_than is None or i < older_than][:limit]
+        return {
+            "messages": [{"id": i} for i in ids],
+            "references": [{"id": i, "type": "user"} for i in ids],
+            "meta": {"older_available": len(ids) == limit},
+        }
+
+
+class PartitionedHistoryTest(TestCase):
+    def setUp(self):
+        self.ids = list(range(100, 140)) + [155, 170, 171, 200]
+        self.client = FakeHistoryClient(self.ids)
+        self.messages_api = MessagesAPI(client=self.client)
+
+    def test_ranges_cover_the_id_space(self):
+        history = PartitionedHistory(self.messages_api, "all", partitions=4)
+
+        ranges = history.ranges()
+
+        self.assertEqual(4, len(ranges))
+        self.assertEqual(201, ranges[0][1])
+        self.assertEqual(100, ranges[-1][0])
+        for newer, older in zip(ranges, ranges[1:]):
+            self.assertEqual(newer[0], older[1])
+
+    def test_fetches_every_message_once_newest_first(self):
+        history = PartitionedHistory(self.messages_api, "from_group",
+                                     target_id=3, partitions=5)
+
+        ids = [message["id"] for page in history.iter_pages()
+               for message in page["messages"]]
+
+        self.assertEqual(sorted(self.ids, reverse=True), ids)
+
+    def test_fetch_merges_pages(self):
+        history = PartitionedHistory(self.messages_api, "all", partitions=3)
+
+        result = history.fetch()
+
+        self.assertEqual(sorted(self.ids),
+                         sorted(message["id"] for message in result.messages))
+        self.assertTrue(len(result["references"]) >= len(self.ids))
+
+    def test_respects_older_than_and_newer_than(self):
+        history = PartitionedHistory(self.messages_api, "all", partitions=2,
+                                     older_than=171, newer_than=130)
+
+        ids = [message["id"] for page in history.iter_pages()
+               for message in page["messages"]]
+
+        self.assertEqual([170, 155] + list(range(139, 130, -1)), ids)
+
+    def test_empty_feeds(self):
+        self.client.ids = []
+        history = PartitionedHistory(self.messages_api, "all")
+
+        self.assertEqual([], history.ranges())
+        self.assertEqual(None, history.fetch())
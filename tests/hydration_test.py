@@ -0,0 +1,99 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+
+from mock import Mock
+
+from yampy.errors import NotFoundError, ResponseError
+from yampy.hydration import EntityCache, Hydrator
+
+
+class EntityCacheTest(TestCase):
+    def test_evicts_least_recently_used_entries(self):
+        cache = EntityCache(max_size=2)
+        cache.set(("user", 1), "one")
+        cache.set(("user", 2), "two")
+        cache.get(("user", 1))
+        cache.set(("user", 3), "three")
+
+        self.assertTrue(("user", 1) in cache)
+        self.assertFalse(("user", 2) in cache)
+        self.assertEqual(2, len(cache))
+
+    def test_add_references(self):
+        cache = EntityCache()
+        cache.add_references([{"type": "group", "id": 5, "name": "Python"}])
+
+        self.assertEqual("Python", cache.get(("group", 5))["name"])
+
+
+class HydratorTest(TestCase):
+    def setUp(self):
+        self.yammer = Mock()
+        self.yammer.users.find.side_effect = \
+            lambda user_id: {"type": "user", "id": user_id}
+        self.yammer.messages.find.side_effect = \
+            lambda message_id: {"messages": [{"id": message_id}]}
+        self.hydrator = Hydrator(self.yammer)
+
+    def test_resolves_missing_references_once(self):
+        page = {
+            "messages": [
+                {"id": 3, "sender_id": 10, "replied_to_id": 1,
+                 "liked_by": {"count": 2, "names": [{"user_id": 10},
+                                                    {"user_id": 11}]}},
+                {"id": 4, "sender_id": 10, "direct_to_id": 11,
+                 "group_id": 5},
+            ],
+            "references": [{"type": "group", "id": 5, "name": "Python"}],
+        }
+
+        self.hydrator.hydrate_page(page)
+
+        first, second = page["messages"]
+        self.assertEqual(10, first["resolved"].sender["id"])
+        self.assertEqual({"id": 1}, first["resolved"].replied_to)
+        self.assertEqual([10, 11],
+                         [user["id"] for user in first["resolved"].liked_by])
+        self.assertEqual(11, second["resolved"].direct_to["id"])
+        self.assertEqual("Python", second["resolved"].group["name"])
+        self.assertEqual(2, self.yammer.users.find.call_count)
+        self.assertFalse(self.yammer.groups.find.called)
+
+    def test_uses_the_cache_between_batches(self):
+        self.hydrator.hydrate([{"id": 1, "sender_id": 10}])
+        self.hydrator.hydrate([{"id": 2, "sender_id": 10}])
+
+        self.assertEqual(1, self.yammer.users.find.call_count)
+
+    def test_missing_objects_resolve_as_none(self):
+        self.yammer.users.find.side_effect = NotFoundError("")
+
+        message, = self.hydrator.hydrate([{"id": 1, "sender_id": 10}])
+
+        self.assertEqual(None, message["resolved"].sender)
+        self.assertTrue(("user", 10) in self.hydrator.cache)
+
+    def test_failed_fetches_are_retried_later(self):
+        self.yammer.users.find.side_effect = ResponseError("500")
+
+        message, = self.hydrator.hydrate([{"id": 1, "sender_id": 10}])
+
+        self.assertEqual(None, message["resolved"].sender)
+        self.assertFalse(("user", 10) in self.hydrator.cache)
@@ -0,0 +1,66 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+
+# A generous upper bound, so that the benchmark catches regressions such as
+# requests being imported eagerly again without being flaky on slow machines.
+MAX_IMPORT_SECONDS = 0.5
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.time()
+import yampy
+elapsed = time.time() - started
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def import_yampy():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SCRIPT],
+                                     cwd=root)
+    return json.loads(output.decode("utf-8"))
+
+
+class ImportTimeTest(TestCase):
+    def test_import_does_not_load_heavy_dependencies(self):
+        modules = import_yampy()["modules"]
+
+        for module in ("requests", "yampy.client", "yampy.apis",
+                       "yampy.authenticator", "yampy.yammer"):
+            self.assertNotIn(module, modules)
+
+    def test_import_time(self):
+        elapsed = min(import_yampy()["elapsed"] for _ in range(3))
+
+        self.assertLess(elapsed, MAX_IMPORT_SECONDS)
+
+    def test_public_names_are_loaded_on_first_use(self):
+        import yampy
+        import yampy.apis
+
+        self.assertEqual("Yammer", yampy.Yammer.__name__)
+        self.assertEqual("MessagesAPI", yampy.apis.MessagesAPI.__name__)
+        self.assertIn("Authenticator", dir(yampy))
+        self.assertRaises(AttributeError, getattr, yampy, "Missing")
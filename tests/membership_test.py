@@ -0,0 +1,94 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import Mock
+
+from yampy.membership import MembershipIndex
+
+
+class MembershipIndexTest(TestCase):
+    def setUp(self):
+        self.members = {
+            1: [10, 11, 12],
+            2: [11],
+            3: [],
+        }
+        self.yammer = Mock()
+        self.yammer.groups.all.side_effect = lambda: [
+            {"id": group_id} for group_id in self.members]
+        self.yammer.groups.iter_members.side_effect = lambda group_id: [
+            {"users": [{"id": u} for u in self.members[group_id]],
+             "more_available": False}]
+
+    def test_crawl_builds_bidirectional_maps(self):
+        index = MembershipIndex.crawl(self.yammer)
+
+        self.assertTrue(index.is_member(11, 2))
+        self.assertTrue(index.is_member({"id": 10}, {"id": 1}))
+        self.assertFalse(index.is_member(10, 2))
+        self.assertFalse(index.is_member(99, 1))
+        self.assertEqual([1, 2], sorted(index.groups_of(11)))
+        self.assertEqual([10, 11, 12], sorted(index.members_of(1)))
+        self.assertEqual([1, 2], sorted(index.group_ids()))
+
+    def test_refresh_updates_changed_groups(self):
+        index = MembershipIndex.crawl(self.yammer)
+        self.members[2] = [10, 12]
+
+        index.refresh(self.yammer, group_ids=[2])
+
+        self.assertFalse(index.is_member(11, 2))
+        self.assertEqual([1, 2], sorted(index.groups_of(10)))
+        self.assertEqual([1], index.groups_of(11))
+
+    def test_full_refresh_drops_deleted_groups(self):
+        index = MembershipIndex.crawl(self.yammer)
+        del self.members[1]
+
+        index.refresh(self.yammer)
+
+        self.assertEqual([], index.members_of(1))
+        self.assertEqual([2], index.groups_of(11))
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "memberships.json")
+            MembershipIndex.crawl(self.yammer).save(path)
+
+            index = MembershipIndex.load(path)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertTrue(index.is_member(12, 1))
+        self.assertEqual([1, 2], sorted(index.groups_of(11)))
+
+    def test_many_users(self):
+        index = MembershipIndex()
+        index.set_members(1, range(1000))
+        index.set_members(2, range(500, 1500))
+
+        self.assertTrue(index.is_member(999, 1))
+        self.assertFalse(index.is_member(1000, 1))
+        self.assertEqual([1, 2], index.groups_of(700))
+        self.assertEqual(1000, len(index.members_of(2)))
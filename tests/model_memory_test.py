@@ -0,0 +1,107 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+A benchmark of the memory used by parsed messages, with and without
+compact mode. Run ``python -m tests.model_memory_test`` to print it.
+"""
+
+import gc
+import json
+from unittest import TestCase, skipIf
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from yampy.models import GenericModel
+
+
+def message_page(first_id, count=20):
+    """
+    Returns the JSON of a page of messages shaped like the API's responses.
+    """
+    return json.dumps({
+        "messages": [{
+            "id": message_id,
+            "sender_id": 1000 + message_id % 50,
+            "sender_type": "user",
+            "message_type": "update",
+            "network_id": 107,
+            "group_id": 2001,
+            "thread_id": message_id - message_id % 5,
+            "replied_to_id": None,
+            "created_at": "2019/09/25 14:03:12 +0000",
+            "url": "https://www.yammer.com/api/v1/messages/%d" % message_id,
+            "web_url": "https://www.yammer.com/example.com/messages/%d"
+                       % message_id,
+            "privacy": "public",
+            "direct_message": False,
+            "system_message": False,
+            "client_type": "Web",
+            "client_url": "https://www.yammer.com/",
+            "language": "en",
+            "body": {
+                "plain": "Message number %d" % message_id,
+                "parsed": "Message number %d" % message_id,
+                "rich": "<p>Message number %d</p>" % message_id,
+            },
+            "attachments": [],
+            "liked_by": {"count": 0, "names": []},
+            "notified_user_ids": [],
+        } for message_id in range(first_id, first_id + count)],
+        "references": [],
+        "meta": {"older_available": True},
+    })
+
+
+def bytes_per_message(compact, pages=50):
+    """
+    Returns the number of bytes retained per message after parsing ``pages``
+    pages of messages.
+    """
+    texts = [message_page(i * 20) for i in range(pages)]
+    gc.collect()
+    tracemalloc.start()
+    parsed = [GenericModel.from_json(text, compact=compact) for text in texts]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / float(sum(len(page["messages"]) for page in parsed))
+
+
+@skipIf(tracemalloc is None, "tracemalloc requires Python 3")
+class ModelMemoryTest(TestCase):
+    def test_compact_mode_uses_less_memory(self):
+        default = bytes_per_message(compact=False, pages=10)
+        compact = bytes_per_message(compact=True, pages=10)
+
+        self.assertLess(compact, default * 0.75)
+
+
+def main():
+    default = bytes_per_message(compact=False)
+    compact = bytes_per_message(compact=True)
+    print("default: %6.0f bytes per message" % default)
+    print("compact: %6.0f bytes per message (%.0f%% less)"
+          % (compact, 100 * (1 - compact / default)))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,13 @@
 # See the Apache Version 2.0 License for specific language governing
 # permissions and limitations under the License.
 
+from datetime import datetime
+import json
+import pickle
 from unittest import TestCase
 
-from yampy.models import GenericModel, extract_id
+from yampy.models import CompactModel, GenericModel, Projection, \
+    StringPool, extract_id, parse_timestamp, utc_datetime
 
 
 class GenericModelTest(TestCase):
@@ -51,3 +55,124 @@ class ExtractIDTest(TestCase):
     def test_fallback_when_extraction_fails(self):
         object_id = extract_id(37)
         self.assertEquals(37, object_id)
+
+
+class TimestampTest(TestCase):
+    def test_parse_timestamp(self):
+        self.assertEqual(datetime(2019, 9, 25, 14, 3, 12),
+                         parse_timestamp("2019/09/25 14:03:12 +0000"))
+
+    def test_parse_timestamp_with_an_offset(self):
+        self.assertEqual(datetime(2019, 9, 25, 12, 33, 12),
+                         parse_timestamp("2019/09/25 14:03:12 +0130"))
+        self.assertEqual(datetime(2019, 9, 25, 19, 3, 12),
+                         parse_timestamp("2019/09/25 14:03:12 -0500"))
+
+    def test_utc_datetime(self):
+        self.assertEqual(datetime(2019, 1, 1),
+                         utc_datetime(datetime(2019, 1, 1)))
+
+
+class ProjectionTest(TestCase):
+    MESSAGE = {
+        "id": 1,
+        "sender_id": 7,
+        "body": {"plain": "Hi", "parsed": "Hi", "rich": "<p>Hi</p>"},
+        "attachments": [{"id": 3, "name": "a.png", "size": 100}],
+        "liked_by": {"count": 0, "names": []},
+    }
+
+    def test_keeps_only_the_selected_paths(self):
+        projection = Projection(["sender_id", "body.plain", "attachments.name"])
+
+        self.assertEqual({
+            "id": 1,
+            "sender_id": 7,
+            "body": {"plain": "Hi"},
+            "attachments": [{"name": "a.png"}],
+        }, projection.apply(dict(self.MESSAGE)))
+
+    def test_applies_to_the_messages_of_an_envelope(self):
+        projection = Projection(["sender_id"])
+        envelope = {
+            "messages": [dict(self.MESSAGE)],
+            "references": [{"type": "user", "id": 7}],
+            "meta": {"older_available": True},
+        }
+
+        result = projection.apply(envelope)
+
+        self.assertEqual([{"id": 1, "sender_id": 7}], result["messages"])
+        self.assertEqual({"older_available": True}, result["meta"])
+        self.assertEqual(1, len(result["references"]))
+
+    def test_applies_to_each_item_of_a_list(self):
+        projection = Projection(["full_name"])
+
+        self.assertEqual([{"id": 1, "full_name": "Joe"}], projection.apply(
+            [{"id": 1, "full_name": "Joe", "stats": {"followers": 2}}]))
+
+    def test_parsing_with_a_projection(self):
+        model = GenericModel.from_json(
+            '{"messages": [{"id": 1, "body": {"plain": "Hi", "rich": "x"}}]}',
+            Projection(["body.plain"]),
+        )
+
+        self.assertEqual("Hi", model.messages[0].body.plain)
+        self.assertNotIn("rich", model.messages[0].body)
+        self.assertIsInstance(model.messages[0].body, GenericModel)
+
+
+class CompactModelTest(TestCase):
+    JSON = ('{"messages": [{"id": 1, "message_type": "update", '
+            '"body": {"plain": "Hi"}}, {"id": 2, "message_type": "update", '
+            '"body": {"plain": "Bye"}}], "meta": {"older_available": false}}')
+
+    def test_parsing_in_compact_mode(self):
+        page = GenericModel.from_json(self.JSON, compact=True)
+
+        self.assertIsInstance(page, GenericModel)
+        first, second = page.messages
+        self.assertIsInstance(first, CompactModel)
+        self.assertEqual("Hi", first.body.plain)
+        self.assertEqual("update", second["message_type"])
+        self.assertEqual(False, page.meta.older_available)
+        self.assertEqual(json.loads(self.JSON)["messages"][0], dict(
+            first, body=dict(first.body)))
+
+    def test_objects_with_the_same_keys_share_them(self):
+        first, second = GenericModel.from_json(self.JSON, compact=True).messages
+
+        self.assertIs(first._shape, second._shape)
+        self.assertIs(first.message_type, second.message_type)
+
+    def test_parsing_with_a_projection_in_compact_mode(self):
+        page = GenericModel.from_json(self.JSON, Projection(["body.plain"]),
+                                      compact=True)
+
+        self.assertEqual({"id": 1, "body": {"plain": "Hi"}},
+                         json.loads(json.dumps(page.messages[0], default=dict)))
+
+    def test_mutation(self):
+        model = CompactModel(id=1, name="Joe")
+
+        model["resolved"] = True
+        model["name"] = "Jane"
+        del model["id"]
+
+        self.assertEqual({"name": "Jane", "resolved": True}, dict(model))
+        self.assertEqual("Jane", model.name)
+        self.assertRaises(AttributeError, getattr, model, "id")
+        self.assertEqual(model, pickle.loads(pickle.dumps(model)))
+
+    def test_string_pool(self):
+        pool = StringPool(max_length=5, max_size=2)
+        first = "".join(["us", "er"])
+        second = "".join(["us", "er"])
+
+        self.assertIs(pool.intern(first), pool.intern(second))
+        long_string = "".join(["a"] * 6)
+        self.assertIs(long_string, pool.intern(long_string))
+        self.assertIsNot(pool.intern(long_string),
+                         pool.intern("".join(["a"] * 6)))
+        self.assertEqual(1, pool.intern(1))
@@ -0,0 +1,84 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from yampy.multipart import MultipartEncoder
+
+
+class MultipartEncoderTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "report.txt")
+        with open(self.path, "wb") as f:
+            f.write(b"x" * 100)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_encodes_files_paths_and_bytes(self):
+        encoder = MultipartEncoder({
+            "attachment1": io.BytesIO(b"hello"),
+            "attachment2": self.path,
+            "attachment3": b"raw",
+        })
+
+        body = encoder.read()
+
+        self.assertEqual(len(encoder), len(body))
+        self.assertTrue(body.endswith(
+            ("--%s--\r\n" % encoder.boundary).encode("ascii")))
+        self.assertEqual(4, body.count(encoder.boundary.encode("ascii")))
+        self.assertTrue(b'filename="report.txt"\r\n'
+                        b'Content-Type: text/plain\r\n\r\n' + b"x" * 100
+                        in body)
+        self.assertTrue(b"\r\n\r\nhello\r\n" in body)
+        self.assertTrue(b"\r\n\r\nraw\r\n" in body)
+        self.assertTrue(encoder.boundary in encoder.content_type)
+
+    def test_reads_in_chunks_and_reports_progress(self):
+        progress = []
+        encoder = MultipartEncoder({"attachment1": self.path},
+                                   progress=lambda *args: progress.append(args),
+                                   chunk_size=10)
+
+        chunks = []
+        while True:
+            chunk = encoder.read(32)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        self.assertTrue(all(len(chunk) <= 32 for chunk in chunks))
+        self.assertEqual(len(encoder), len(b"".join(chunks)))
+        self.assertEqual((len(encoder), len(encoder)), progress[-1])
+        self.assertEqual(len(chunks), len(progress))
+
+    def test_starts_from_the_current_file_position(self):
+        attachment = io.BytesIO(b"skipped|kept")
+        attachment.read(8)
+        encoder = MultipartEncoder({"attachment1": attachment})
+
+        body = encoder.read()
+
+        self.assertTrue(b"\r\n\r\nkept\r\n" in body)
+        self.assertEqual(len(encoder), len(body))
@@ -0,0 +1,85 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+
+from mock import Mock
+
+from yampy.errors import ResponseError
+from yampy.org_chart import OrgChart
+
+
+# ceo -> (cto, cfo); cto -> (dev1, dev2); dev1 and dev2 are colleagues
+RELATIONSHIPS = {
+    1: {"superiors": [], "subordinates": [{"id": 2}, {"id": 3}]},
+    2: {"superiors": [{"id": 1}], "subordinates": [{"id": 4}, {"id": 5}]},
+    3: {"superiors": [{"id": 1}], "subordinates": []},
+    4: {"superiors": [{"id": 2}], "colleagues": [{"id": 5}]},
+    5: {"superiors": [{"id": 2}], "colleagues": [{"id": 4}]},
+}
+
+
+class OrgChartTest(TestCase):
+    def setUp(self):
+        self.yammer = Mock()
+        self.yammer.relationships.all.side_effect = \
+            lambda user_id: RELATIONSHIPS[user_id]
+
+    def test_crawl_discovers_the_whole_chart(self):
+        chart = OrgChart.crawl(self.yammer, [4])
+
+        self.assertEqual(5, self.yammer.relationships.all.call_count)
+        self.assertEqual([2, 1], chart.chain_of_command(4))
+        self.assertEqual([2, 3, 4, 5], chart.descendants(1))
+        self.assertEqual([2, 1], chart.ancestors({"id": 5}))
+        self.assertEqual(2, chart.span_of_control(2))
+        self.assertEqual([5], chart.colleagues(4))
+        self.assertTrue(chart.reports_to(4, 1))
+        self.assertFalse(chart.reports_to(3, 2))
+
+    def test_max_depth(self):
+        chart = OrgChart.crawl(self.yammer, [4], max_depth=0)
+
+        self.assertEqual(1, self.yammer.relationships.all.call_count)
+        self.assertEqual([2], chart.superiors(4))
+        self.assertEqual([], chart.superiors(2))
+
+    def test_max_users(self):
+        OrgChart.crawl(self.yammer, [1], max_users=2)
+
+        self.assertEqual(2, self.yammer.relationships.all.call_count)
+
+    def test_failures_are_reported(self):
+        def relationships(user_id):
+            if user_id == 3:
+                raise ResponseError("500")
+            return RELATIONSHIPS[user_id]
+        self.yammer.relationships.all.side_effect = relationships
+
+        chart = OrgChart()
+        failures = chart.expand(self.yammer, [1])
+
+        self.assertEqual([3], list(failures))
+        self.assertEqual([2, 3, 4, 5], chart.descendants(1))
+
+    def test_chain_of_command_survives_cycles(self):
+        chart = OrgChart()
+        chart._link(1, 2)
+        chart._link(2, 1)
+
+        self.assertEqual([1], chart.chain_of_command(2))
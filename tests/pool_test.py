@@ -0,0 +1,95 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+from mock import Mock
+
+from yampy import Yammer
+from yampy.pool import YammerPool
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class YammerPoolTest(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.session = Mock()
+        self.pool = YammerPool(max_size=2, idle_timeout=60,
+                               session=self.session, clock=self.clock)
+
+    def test_get_returns_the_same_instance_for_a_token(self):
+        yammer = self.pool.get("abc")
+
+        self.assertIsInstance(yammer, Yammer)
+        self.assertIs(yammer, self.pool.get("abc"))
+        self.assertIsNot(yammer, self.pool.get("xyz"))
+
+    def test_tenants_share_the_session_but_not_the_token(self):
+        first = self.pool.get("abc").client
+        second = self.pool.get("xyz").client
+
+        self.assertIs(self.session, first._transport.session)
+        self.assertIs(self.session, second._transport.session)
+        self.assertEqual("abc", first._access_token)
+        self.assertEqual("xyz", second._access_token)
+
+    def test_tenants_get_their_own_rate_limiters(self):
+        pool = YammerPool(session=self.session, rate_limiter_factory=Mock)
+
+        first = pool.get("abc").client._rate_limiter
+        second = pool.get("xyz").client._rate_limiter
+
+        self.assertIsNotNone(first)
+        self.assertIsNot(first, second)
+
+    def test_least_recently_used_tenants_are_evicted(self):
+        self.pool.get("a")
+        self.pool.get("b")
+        self.pool.get("a")
+        self.pool.get("c")
+
+        self.assertEqual(2, len(self.pool))
+        self.assertIn("a", self.pool)
+        self.assertNotIn("b", self.pool)
+
+    def test_idle_tenants_expire(self):
+        self.pool.get("a")
+        self.clock.now = 30
+        self.pool.get("b")
+        self.clock.now = 60
+        self.pool.prune()
+
+        self.assertNotIn("a", self.pool)
+        self.assertIn("b", self.pool)
+
+    def test_discard_and_close(self):
+        self.pool.get("a")
+        self.pool.discard("a")
+        self.pool.discard("missing")
+        self.assertNotIn("a", self.pool)
+
+        self.pool.get("b")
+        self.pool.close()
+        self.assertEqual(0, len(self.pool))
+        self.session.close.assert_called_once_with()
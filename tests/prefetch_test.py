@@ -0,0 +1,100 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+import threading
+from unittest import TestCase
+
+from yampy.prefetch import iter_numbered_pages, prefetch
+
+
+class PrefetchTest(TestCase):
+    def test_yields_every_item_in_order(self):
+        self.assertEqual(list(range(10)), list(prefetch(iter(range(10)))))
+
+    def test_fetches_ahead_while_the_caller_is_busy(self):
+        fetched = []
+        third_fetched = threading.Event()
+
+        def items():
+            for i in range(5):
+                fetched.append(i)
+                if i == 2:
+                    third_fetched.set()
+                yield i
+
+        pages = prefetch(items(), depth=2)
+        self.assertEqual(0, next(pages))
+        self.assertTrue(third_fetched.wait(timeout=5))
+        pages.close()
+
+    def test_reraises_errors(self):
+        def items():
+            yield 1
+            raise ValueError("boom")
+
+        pages = prefetch(items())
+
+        self.assertEqual(1, next(pages))
+        self.assertRaises(ValueError, next, pages)
+
+    def test_stops_producing_when_closed(self):
+        fetched = []
+
+        def items():
+            for i in range(1000):
+                fetched.append(i)
+                yield i
+
+        pages = prefetch(items(), depth=1)
+        next(pages)
+        pages.close()
+
+        self.assertTrue(len(fetched) < 1000)
+
+
+class IterNumberedPagesTest(TestCase):
+    def test_stops_at_the_first_empty_page(self):
+        pages = {1: ["a", "b"], 2: ["c"]}
+
+        result = list(iter_numbered_pages(lambda n: pages.get(n, [])))
+
+        self.assertEqual([["a", "b"], ["c"]], result)
+
+    def test_stops_when_no_more_pages_are_available(self):
+        requested = []
+
+        def fetch(number):
+            requested.append(number)
+            return {"users": [number], "more_available": number < 2}
+
+        result = list(iter_numbered_pages(fetch, depth=3))
+
+        self.assertEqual([[1], [2]], [page["users"] for page in result])
+
+    def test_requests_pages_ahead(self):
+        requested = []
+
+        def fetch(number):
+            requested.append(number)
+            return [number]
+
+        pages = iter_numbered_pages(fetch, depth=3)
+        next(pages)
+        pages.close()
+
+        self.assertTrue(3 in requested)
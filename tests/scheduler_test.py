@@ -0,0 +1,118 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+import threading
+import time
+
+from yampy.deadline import bind
+from yampy.scheduler import (BATCH, INTERACTIVE, RequestScheduler,
+                             current_priority, priority)
+
+
+class RequestSchedulerTest(TestCase):
+    def setUp(self):
+        self.order = []
+        self.threads = []
+
+    def tearDown(self):
+        for thread in self.threads:
+            thread.join(5)
+
+    def queue(self, scheduler, name):
+        """
+        Starts a thread that waits for a slot, records its class and frees
+        the slot again, and waits until it is queued.
+        """
+        queued = scheduler.queued()[name]
+
+        def run():
+            scheduler.acquire(name)
+            self.order.append(name)
+            scheduler.release()
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+        while scheduler.queued()[name] == queued:
+            time.sleep(0.001)
+
+    def test_requests_run_immediately_below_the_limit(self):
+        scheduler = RequestScheduler(max_concurrent=2)
+
+        self.assertTrue(scheduler.acquire())
+        self.assertTrue(scheduler.acquire(BATCH))
+        self.assertFalse(scheduler.acquire(timeout=0.01))
+        self.assertEqual({INTERACTIVE: 0, BATCH: 0}, scheduler.queued())
+
+    def test_interactive_requests_jump_ahead_of_batch_requests(self):
+        scheduler = RequestScheduler(max_concurrent=1)
+        scheduler.acquire()
+        self.queue(scheduler, BATCH)
+        self.queue(scheduler, BATCH)
+        self.queue(scheduler, INTERACTIVE)
+
+        scheduler.release()
+        self.tearDown()
+
+        self.assertEqual([INTERACTIVE, BATCH, BATCH], self.order)
+
+    def test_weighted_classes_share_slots_by_weight(self):
+        scheduler = RequestScheduler(max_concurrent=1,
+                                     weights={"high": 3, "low": 1},
+                                     default_priority="high")
+        scheduler.acquire()
+        for i in range(4):
+            self.queue(scheduler, "low")
+            self.queue(scheduler, "high")
+
+        scheduler.release()
+        self.tearDown()
+
+        self.assertEqual(3, self.order[:4].count("high"))
+        self.assertEqual(["low"] * 2, self.order[-2:])
+
+    def test_timed_out_requests_leave_the_queue(self):
+        scheduler = RequestScheduler(max_concurrent=1)
+        scheduler.acquire()
+
+        self.assertFalse(scheduler.acquire(BATCH, timeout=0.01))
+        self.assertEqual(0, scheduler.queued()[BATCH])
+
+    def test_unknown_priority_classes(self):
+        scheduler = RequestScheduler()
+        self.assertRaises(ValueError, scheduler.acquire, "urgent")
+        self.assertRaises(ValueError, RequestScheduler,
+                          default_priority="urgent")
+
+
+class PriorityTest(TestCase):
+    def test_priority_is_set_within_its_block(self):
+        self.assertEqual(None, current_priority())
+        with priority(BATCH):
+            self.assertEqual(BATCH, current_priority())
+        self.assertEqual(None, current_priority())
+
+    def test_bind_carries_the_priority_to_other_threads(self):
+        seen = []
+        with priority(BATCH):
+            thread = threading.Thread(
+                target=bind(lambda: seen.append(current_priority())))
+            thread.start()
+            thread.join()
+
+        self.assertEqual([BATCH], seen)
@@ -0,0 +1,96 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from yampy.search_index import SearchIndex, decode_positions, \
+    encode_positions, tokenize
+
+
+def message(message_id, text):
+    return {"id": message_id, "body": {"plain": text}}
+
+
+class TokenizeTest(TestCase):
+    def test_tokenize(self):
+        self.assertEqual(["hello", "world", "42"],
+                         tokenize("Hello, World! 42"))
+
+    def test_position_encoding_round_trips(self):
+        positions = [0, 1, 5, 200, 100000]
+
+        encoded = encode_positions(positions)
+
+        self.assertEqual(positions, decode_positions(encoded))
+        self.assertTrue(len(encoded) < 4 * len(positions))
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add_page({"messages": [
+            message(1, "The quarterly results are in"),
+            message(2, "Results of the hackathon: python wins"),
+            message(3, "Lunch is served"),
+            message(4, "Quarterly planning: results, results, results"),
+        ]})
+
+    def test_search_ranks_by_bm25(self):
+        results = self.index.search("quarterly results")
+
+        self.assertEqual([4, 1, 2], [message_id for message_id, _ in results])
+        self.assertTrue(results[0][1] > results[1][1] > results[2][1])
+
+    def test_search_without_matches(self):
+        self.assertEqual([], self.index.search("nothing"))
+        self.assertEqual([], self.index.search(""))
+
+    def test_phrase_queries(self):
+        self.assertEqual([1], self.index.phrase("quarterly results"))
+        self.assertEqual([1], [message_id for message_id, _
+                               in self.index.search('"quarterly results"')])
+
+    def test_updates_replace_earlier_versions(self):
+        self.index.add_message(message(3, "Quarterly lunch"))
+
+        self.assertEqual(4, len(self.index))
+        self.assertEqual([], self.index.search("served"))
+        self.assertTrue(3 in [m for m, _ in self.index.search("quarterly")])
+
+    def test_remove_message(self):
+        self.index.remove_message({"id": 4})
+
+        self.assertFalse(4 in self.index)
+        self.assertEqual([1], [m for m, _ in self.index.search("quarterly")])
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "search.idx")
+            self.index.save(path)
+            index = SearchIndex.load(path)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(self.index.search("quarterly results"),
+                         index.search("quarterly results"))
+        index.remove_message(1)
+        self.assertEqual([], index.phrase("quarterly results"))
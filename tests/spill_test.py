@@ -0,0 +1,79 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+
+from yampy.apis.messages import merge_messages
+from yampy.spill import SpilledMessages, SpillingMerger
+
+
+def page(first_id, count=3):
+    return {
+        "messages": [{"id": i, "body": {"plain": "Message %d" % i}}
+                     for i in range(first_id, first_id - count, -1)],
+        "references": [{"type": "user", "id": first_id}],
+        "meta": {"older_available": first_id > count},
+    }
+
+
+class SpilledMessagesTest(TestCase):
+    def setUp(self):
+        self.messages = SpilledMessages()
+        self.addCleanup(self.messages.close)
+        self.messages.append_page(page(9)["messages"])
+        self.messages.append_page(page(6)["messages"])
+
+    def test_pages_are_presented_last_page_first(self):
+        self.assertEqual([6, 5, 4, 9, 8, 7], [m.id for m in self.messages])
+
+    def test_indexing(self):
+        self.assertEqual(6, len(self.messages))
+        self.assertEqual("Message 4", self.messages[2].body.plain)
+        self.assertEqual(7, self.messages[-1].id)
+        self.assertEqual([5, 4], [m.id for m in self.messages[1:3]])
+        self.assertRaises(IndexError, lambda: self.messages[6])
+
+
+class SpillingMergerTest(TestCase):
+    def merge(self, max_memory):
+        merger = SpillingMerger(merge_messages, max_memory=max_memory)
+        for first_id in (9, 6, 3):
+            merger.add(page(first_id))
+        return merger
+
+    def test_small_results_stay_in_memory(self):
+        merger = self.merge(max_memory=10000)
+
+        self.assertFalse(merger.spilled)
+        self.assertIsInstance(merger.result()["messages"], list)
+
+    def test_spilled_results_match_in_memory_results(self):
+        expected = self.merge(max_memory=10000).result()
+
+        merger = self.merge(max_memory=100)
+        result = merger.result()
+        self.addCleanup(result["messages"].close)
+
+        self.assertTrue(merger.spilled)
+        self.assertIsInstance(result["messages"], SpilledMessages)
+        self.assertEqual(expected["messages"], list(result["messages"]))
+        self.assertEqual(expected["references"], result["references"])
+        self.assertEqual(expected["meta"], result["meta"])
+
+    def test_no_pages(self):
+        self.assertEqual(None, SpillingMerger(merge_messages).result())
@@ -32,50 +32,45 @@ class HTTPHelpers(object):
 
     def setUp(self):
         self.__original_request_method = requests.request
+        self.__original_session_request_method = requests.Session.request
 
     def tearDown(self):
         requests.request = self.__original_request_method
+        requests.Session.request = self.__original_session_request_method
 
-    def stub_get_requests(self, response_body="{}", response_status=200):
+    def stub_requests(self, response_body="{}", response_status=200):
+        """
+        Stubs requests made with ``requests.request`` and through
+        ``requests.Session`` objects with the same mock.
+        """
         mock_response = Mock(
             text=response_body,
             status_code=response_status,
             reason="",
         )
         requests.request = Mock(return_value=mock_response)
+        requests.Session.request = requests.request
+
+    def stub_get_requests(self, response_body="{}", response_status=200):
+        self.stub_requests(response_body, response_status)
 
     def assert_get_request(self, url, params=ANY, headers=ANY, proxies=ANY, files=ANY):
         self.assert_request("get", url, params, headers, proxies, files)
 
     def stub_post_requests(self, response_body="{}", response_status=200):
-        mock_response = Mock(
-            text=response_body,
-            status_code=response_status,
-            reason="",
-        )
-        requests.request = Mock(return_value=mock_response)
+        self.stub_requests(response_body, response_status)
 
     def assert_post_request(self, url, params=ANY, headers=ANY, proxies=ANY, files=ANY):
         self.assert_request("post", url, params, headers, proxies, files)
 
     def stub_delete_requests(self, response_body="{}", response_status=200):
-        mock_response = Mock(
-            text=response_body,
-            status_code=response_status,
-            reason="",
-        )
-        requests.request = Mock(return_value=mock_response)
+        self.stub_requests(response_body, response_status)
 
     def assert_delete_request(self, url, params=ANY, headers=ANY, proxies=ANY, files=ANY):
         self.assert_request("delete", url, params, headers, proxies, files)
 
     def stub_put_requests(self, response_body="{}", response_status=200):
-        mock_response = Mock(
-            text=response_body,
-            status_code=response_status,
-            reason="",
-        )
-        requests.request = Mock(return_value=mock_response)
+        self.stub_requests(response_body, response_status)
 
     def assert_put_request(self, url, params=ANY, headers=ANY, proxies=ANY, files=ANY):
         self.assert_request("put", url, params, headers, proxies, files)
@@ -0,0 +1,89 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+
+from yampy.thread_builder import ThreadBuilder
+
+
+def message(message_id, replied_to_id=None, thread_id=1, created_at=None):
+    return {
+        "id": message_id,
+        "replied_to_id": replied_to_id,
+        "thread_id": thread_id,
+        "created_at": created_at or "2019/01/%02d" % message_id,
+    }
+
+
+class ThreadBuilderTest(TestCase):
+    def test_builds_a_reply_tree(self):
+        builder = ThreadBuilder([
+            message(4, replied_to_id=2),
+            message(3, replied_to_id=1),
+            message(2, replied_to_id=1),
+            message(1),
+        ])
+
+        roots = builder.thread(1)
+        self.assertEqual([1], [node.id for node in roots])
+        root = roots[0]
+        self.assertEqual([2, 3], [child.id for child in root.children])
+        self.assertEqual(2, root.child_count)
+        self.assertEqual(3, root.descendant_count)
+        self.assertEqual("2019/01/04", root.latest_activity)
+        self.assertEqual(2, builder.node(4).depth)
+        self.assertEqual([1, 2, 4, 3], [node.id for node in root.walk()])
+
+    def test_replies_without_parents_are_provisional_roots(self):
+        builder = ThreadBuilder()
+        builder.add_page({"messages": [message(5, replied_to_id=3),
+                                       message(4, replied_to_id=3)]})
+
+        self.assertEqual([4, 5], [node.id for node in builder.thread(1)])
+
+        builder.add_page({"messages": [message(3, replied_to_id=1)]})
+        self.assertEqual([3], [node.id for node in builder.thread(1)])
+
+        builder.add_page({"messages": [message(1)]})
+        root, = builder.thread(1)
+        self.assertEqual(1, root.id)
+        self.assertEqual(3, root.descendant_count)
+        self.assertEqual("2019/01/05", root.latest_activity)
+        self.assertEqual(2, builder.node(5).depth)
+
+    def test_new_replies_update_ancestors(self):
+        builder = ThreadBuilder([message(1), message(2, replied_to_id=1)])
+        builder.add_messages([message(9, replied_to_id=2)])
+
+        root = builder.node(1)
+        self.assertEqual(2, root.descendant_count)
+        self.assertEqual("2019/01/09", root.latest_activity)
+
+    def test_readding_a_message_replaces_it(self):
+        builder = ThreadBuilder([message(1)])
+        edited = dict(message(1), body="edited")
+        builder.add_messages([edited])
+
+        self.assertEqual(1, len(builder))
+        self.assertEqual("edited", builder.node(1).message["body"])
+
+    def test_threads_are_kept_apart(self):
+        builder = ThreadBuilder([message(1, thread_id=1),
+                                 message(2, thread_id=2)])
+
+        self.assertEqual([1, 2], sorted(builder.threads()))
@@ -0,0 +1,65 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+from unittest import TestCase
+
+from yampy.token_store import MemoryTokenStore
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class MemoryTokenStoreTest(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = MemoryTokenStore(max_size=2, clock=self.clock)
+
+    def test_get_and_set(self):
+        self.store.set("token:abc", {"user": {"id": 1}})
+
+        self.assertEqual({"user": {"id": 1}}, self.store.get("token:abc"))
+        self.assertEqual(None, self.store.get("token:xyz"))
+
+    def test_entries_expire(self):
+        self.store.set("token:abc", True, ttl=10)
+
+        self.clock.now = 9
+        self.assertEqual(True, self.store.get("token:abc"))
+        self.clock.now = 10
+        self.assertEqual(None, self.store.get("token:abc"))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.store.set("a", 1)
+        self.store.set("b", 2)
+        self.store.get("a")
+        self.store.set("c", 3)
+
+        self.assertEqual(1, self.store.get("a"))
+        self.assertEqual(None, self.store.get("b"))
+
+    def test_delete(self):
+        self.store.set("a", 1)
+        self.store.delete("a")
+        self.store.delete("missing")
+
+        self.assertEqual(None, self.store.get("a"))
@@ -0,0 +1,84 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from yampy.topic_index import TopicIndex
+
+
+class TopicIndexTest(TestCase):
+    def setUp(self):
+        self.index = TopicIndex()
+        self.index.add_page({
+            "messages": [
+                {"id": 1, "topics": [10, 20]},
+                {"id": 2, "topics": [{"id": 10}]},
+                {"id": 3, "topics": [10, 20, 30]},
+                {"id": 4},
+            ],
+            "references": [{"type": "topic", "id": 10, "name": "python"}],
+        })
+
+    def test_messages_about(self):
+        self.assertEqual([3, 2, 1], self.index.messages_about(10))
+        self.assertEqual([3], self.index.messages_about({"id": 30}))
+        self.assertEqual([], self.index.messages_about(99))
+        self.assertEqual([10, 20, 30], self.index.topics_of(3))
+
+    def test_top_topics(self):
+        self.assertEqual([(10, 3), (20, 2)], self.index.top_topics(2))
+
+    def test_co_occurring(self):
+        self.assertEqual([(20, 2), (30, 1)], self.index.co_occurring(10))
+
+    def test_explicit_topic(self):
+        self.index.add_messages([{"id": 5}], topic_id=30)
+
+        self.assertEqual([5, 3], self.index.messages_about(30))
+
+    def test_adding_a_message_twice(self):
+        self.index.add_messages([{"id": 1, "topics": [10, 20]}])
+
+        self.assertEqual(3, self.index.message_count(10))
+        self.assertEqual([(20, 2), (30, 1)], self.index.co_occurring(10))
+
+    def test_remove_message(self):
+        self.index.remove_message(3)
+
+        self.assertEqual([2, 1], self.index.messages_about(10))
+        self.assertEqual([(20, 1)], self.index.co_occurring(10))
+        self.assertEqual([], self.index.messages_about(30))
+
+    def test_names(self):
+        self.assertEqual("python", self.index.name(10))
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "topics.json")
+            self.index.save(path)
+            index = TopicIndex.load(path)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual([3, 2, 1], index.messages_about(10))
+        self.assertEqual([(20, 2), (30, 1)], index.co_occurring(10))
+        self.assertEqual("python", index.name(10))
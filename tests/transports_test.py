@@ -0,0 +1,223 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Tests for the transports, against a local HTTP server, and a benchmark that
+compares them. Run ``python -m tests.transports_test`` to print the
+benchmark's results.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+from unittest import TestCase, skipIf
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+import requests
+
+from yampy import Client
+from yampy.errors import NotFoundError
+from yampy.transports import (HttpxTransport, RequestsTransport,
+                              Urllib3Transport)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.startswith("/api/v1/missing"):
+            self._respond(404, b"")
+        else:
+            self._respond(200, self._echo(b""))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._respond(201, self._echo(self.rfile.read(length)))
+
+    def _echo(self, body):
+        return json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "authorization": self.headers.get("Authorization"),
+            "content_type": self.headers.get("Content-Type"),
+            "body": body.decode("utf-8", "replace"),
+        }).encode("utf-8")
+
+    def _respond(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class LocalServer(object):
+    """
+    An HTTP server on a free local port that echoes requests back as JSON.
+    """
+
+    def __init__(self):
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self.base_url = "http://127.0.0.1:%d/api/v1" % self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={"poll_interval": 0.05})
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def transports():
+    """
+    Returns the available transports, by name.
+    """
+    available = {
+        "requests": lambda: RequestsTransport(),
+        "requests.Session": lambda: RequestsTransport(requests.Session()),
+        "urllib3": lambda: Urllib3Transport(),
+    }
+    if httpx is not None:
+        available["httpx"] = lambda: HttpxTransport(http2=False)
+    return available
+
+
+def benchmark(client, requests_count=200, concurrency=16):
+    """
+    Returns the mean latency of ``requests_count`` sequential GET requests
+    and the throughput of as many requests made from ``concurrency``
+    threads.
+    """
+    started = time.time()
+    for i in range(requests_count):
+        client.get("/messages", page=i)
+    latency = (time.time() - started) / requests_count
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    started = time.time()
+    try:
+        list(executor.map(lambda i: client.get("/messages", page=i),
+                          range(requests_count)))
+    finally:
+        executor.shutdown(wait=True)
+    throughput = requests_count / (time.time() - started)
+    return latency, throughput
+
+
+class TransportTestMixin(object):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.transport = self.make_transport()
+        self.client = Client(access_token="abc123",
+                             base_url=self.server.base_url,
+                             transport=self.transport)
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_get(self):
+        response = self.client.get("/messages", older_than=5, threaded=True,
+                                   newer_than=None)
+
+        self.assertEqual("GET", response.method)
+        self.assertEqual("/api/v1/messages.json?older_than=5&threaded=True",
+                         response.path)
+        self.assertEqual("Bearer abc123", response.authorization)
+
+    def test_post_with_files(self):
+        response = self.client.post("/messages", body="Hi",
+                                    files={"attachment1": b"hello"})
+
+        self.assertEqual("/api/v1/messages.json?body=Hi", response.path)
+        self.assertIn("multipart/form-data", response.content_type)
+        self.assertIn("hello", response.body)
+
+    def test_errors(self):
+        self.assertRaises(NotFoundError, self.client.get, "/missing")
+
+    def test_benchmark(self):
+        latency, throughput = benchmark(self.client, requests_count=20,
+                                        concurrency=4)
+
+        self.assertTrue(latency > 0)
+        self.assertTrue(throughput > 0)
+
+
+class RequestsTransportTest(TransportTestMixin, TestCase):
+    def make_transport(self):
+        return RequestsTransport(requests.Session())
+
+
+class Urllib3TransportTest(TransportTestMixin, TestCase):
+    def make_transport(self):
+        return Urllib3Transport()
+
+
+@skipIf(httpx is None, "httpx is not installed")
+class HttpxTransportTest(TransportTestMixin, TestCase):
+    def make_transport(self):
+        # The local server only speaks HTTP/1.1.
+        return HttpxTransport(http2=False)
+
+
+def main():
+    server = LocalServer()
+    try:
+        print("%-20s %12s %16s" % ("transport", "latency (ms)",
+                                   "throughput (/s)"))
+        for name, make_transport in sorted(transports().items()):
+            transport = make_transport()
+            client = Client(base_url=server.base_url, transport=transport)
+            benchmark(client, requests_count=20)
+            latency, throughput = benchmark(client, requests_count=1000)
+            transport.close()
+            print("%-20s %12.3f %16.0f" % (name, latency * 1000, throughput))
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,8 +19,37 @@
 The official Python client for Yammer's API
 """
 
-from .authenticator import Authenticator
-from .client import Client
-from .yammer import Yammer
+import sys
 
 __version__ = '2.8.0'
+
+# The public classes are imported on first use, so that ``import yampy`` does
+# not pay for importing requests and every API module up front.
+_LAZY_ATTRIBUTES = {
+    "Authenticator": ".authenticator",
+    "Client": ".client",
+    "Yammer": ".yammer",
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name))
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported before Python 3.7.
+    from .authenticator import Authenticator
+    from .client import Client
+    from .yammer import Yammer
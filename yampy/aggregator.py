@@ -0,0 +1,156 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Merging several message feeds into one stream, newest first.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+from itertools import islice
+
+from .concurrency import DEFAULT_MAX_WORKERS
+from .deadline import bind
+
+
+class FeedAggregator(object):
+    """
+    Fetches several :class:`yampy.apis.MessagesAPI` feeds concurrently and
+    merges them lazily, newest first, without duplicates::
+
+        aggregator = FeedAggregator(yammer.messages, [
+            "from_my_feed",
+            "private",
+            ("from_group", 123),
+            ("from_group", 456),
+        ])
+        digest = aggregator.latest(50)
+
+    The first page of every feed is requested up front, in parallel. After
+    that each feed has at most one page in flight, requested as soon as the
+    previous page arrives, so only as much history is downloaded as the
+    merge actually consumes.
+    """
+
+    def __init__(self, messages_api, feeds, order_by="id", limit=None,
+                 threaded=None, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        * ``feeds`` -- A list of feed names accepted by
+          :meth:`yampy.apis.MessagesAPI.iter_pages`. Feeds that need a group,
+          thread, user or topic are given as ``(feed, target_id)`` tuples.
+        * ``order_by`` -- Either ``"id"`` (the default) or ``"created_at"``.
+        * ``limit`` -- The number of messages to request per page.
+        * ``threaded`` -- Passed to every feed; see
+          :meth:`yampy.apis.MessagesAPI.all`.
+        * ``max_workers`` -- The maximum number of concurrent requests.
+        """
+        if order_by not in ("id", "created_at"):
+            raise ValueError("Cannot order messages by %s" % order_by)
+        self._messages_api = messages_api
+        self._feeds = [feed if isinstance(feed, tuple) else (feed, None)
+                       for feed in feeds]
+        self._order_by = order_by
+        self._limit = limit
+        self._threaded = threaded
+        self._max_workers = max_workers
+
+    def latest(self, count):
+        """
+        Returns the newest ``count`` messages across all the feeds.
+        """
+        return list(islice(self, count))
+
+    def __iter__(self):
+        """
+        Yields every message across all the feeds, newest first. Stopping
+        early cancels any page requests that have not started yet.
+        """
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        cursors = [
+            _FeedCursor(self._messages_api.iter_pages(
+                feed, target_id, limit=self._limit, threaded=self._threaded,
+            ), executor)
+            for feed, target_id in self._feeds
+        ]
+        try:
+            heap = []
+            for cursor in cursors:
+                self._push(heap, cursor)
+            seen = set()
+            while heap:
+                entry = heapq.heappop(heap)
+                self._push(heap, entry.cursor)
+                if entry.message_id not in seen:
+                    seen.add(entry.message_id)
+                    yield entry.message
+        finally:
+            for cursor in cursors:
+                cursor.cancel()
+            executor.shutdown(wait=False)
+
+    def _push(self, heap, cursor):
+        message = cursor.next_message()
+        if message is not None:
+            heapq.heappush(heap, _Entry(message[self._order_by], message,
+                                        cursor))
+
+
+class _Entry(object):
+    """
+    A heap entry that sorts newest first, breaking ties by message id.
+    """
+
+    def __init__(self, key, message, cursor):
+        self.key = key
+        self.message_id = message["id"]
+        self.message = message
+        self.cursor = cursor
+
+    def __lt__(self, other):
+        return (self.key, self.message_id) > (other.key, other.message_id)
+
+
+class _FeedCursor(object):
+    """
+    Buffers the messages of one feed, keeping its next page in flight.
+    """
+
+    def __init__(self, pages, executor):
+        self._pages = pages
+        self._executor = executor
+        self._buffer = deque()
+        self._pending = executor.submit(bind(next), pages, None)
+
+    def next_message(self):
+        while not self._buffer:
+            if self._pending is None:
+                return None
+            page = self._pending.result()
+            if page is None:
+                self._pending = None
+                return None
+            self._buffer.extend(page.get("messages", ()))
+            self._pending = self._executor.submit(bind(next), self._pages,
+                                                  None)
+        return self._buffer.popleft()
+
+    def cancel(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
@@ -19,9 +19,40 @@
 API classes which make requests to a group of Yammer API endpoints.
 """
 
-from .messages import MessagesAPI
-from .users import UsersAPI
-from .threads import ThreadsAPI
-from .topics import TopicsAPI
-from .groups import GroupsAPI
-from .relationships import RelationshipsAPI
+import sys
+
+# The API classes are imported on first use; see yampy/__init__.py.
+_LAZY_ATTRIBUTES = {
+    "MessagesAPI": ".messages",
+    "UsersAPI": ".users",
+    "ThreadsAPI": ".threads",
+    "TopicsAPI": ".topics",
+    "GroupsAPI": ".groups",
+    "RelationshipsAPI": ".relationships",
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name))
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported before Python 3.7.
+    from .messages import MessagesAPI
+    from .users import UsersAPI
+    from .threads import ThreadsAPI
+    from .topics import TopicsAPI
+    from .groups import GroupsAPI
+    from .relationships import RelationshipsAPI
@@ -1,5 +1,6 @@
 from yampy.apis.utils import ArgumentConverter, none_filter, stringify_booleans
 from yampy.models import extract_id
+from yampy.prefetch import DEFAULT_DEPTH, iter_numbered_pages
 
 
 class GroupsAPI(object):
@@ -42,18 +43,29 @@ class GroupsAPI(object):
 
     def members(self, group_id, page=None, reverse=None):
         """
-        Returns the group identified by the given group_id.
+        Returns the members of the group identified by the given group_id.
 
         Customize the response using the keyword arguments:
 
         * page -- Enable pagination, and return the nth page of 50 users.
         """
-        path = "/group_memberships"
+        path = "/users/in_group/%d" % extract_id(group_id)
         return self._client.get(path, **self._argument_converter(
             page=page,
             reverse=reverse,
         ))
 
+    def iter_members(self, group_id, reverse=None, prefetch=DEFAULT_DEPTH):
+        """
+        Yields every page of members of the group identified by the given
+        group_id, requesting the next ``prefetch`` pages in the background
+        while each page is being processed.
+        """
+        return iter_numbered_pages(
+            lambda page: self.members(group_id, page=page, reverse=reverse),
+            depth=prefetch,
+        )
+
     def join(self, group_id):
         """
         Join the group identified by the given group_id.
@@ -15,10 +15,33 @@
 # See the Apache Version 2.0 License for specific language governing
 # permissions and limitations under the License.
 
-from yampy.errors import InvalidOpenGraphObjectError, TooManyTopicsError
-from yampy.apis.utils import ArgumentConverter, IDExtractor, flatten_lists, \
+from yampy.concurrency import DEFAULT_MAX_WORKERS, run_bulk
+from yampy.errors import DeadlineExceededError, \
+                         InvalidOpenGraphObjectError, NotFoundError, \
+                         TooManyTopicsError
+from yampy.apis.utils import ArgumentConverter, IDExtractor, \
+                             ProjectingClient, flatten_lists, \
                              flatten_dicts, stringify_booleans, none_filter
-from yampy.models import extract_id
+from yampy.models import Projection, extract_id, parse_timestamp, \
+                         utc_datetime
+from yampy.multipart import MultipartEncoder
+from yampy.prefetch import prefetch as prefetch_iterator
+from yampy.spill import DEFAULT_MAX_MEMORY, SpillingMerger
+
+
+FEED_PATHS = {
+    "all": "/messages",
+    "from_my_feed": "/messages/my_feed",
+    "from_top_conversations": "/messages/algo",
+    "from_followed_conversations": "/messages/following",
+    "from_group": "/messages/in_group/%d",
+    "sent": "/messages/sent",
+    "private": "/messages/private",
+    "received": "/messages/received",
+    "in_thread": "/messages/in_thread/%d",
+    "from_user": "/messages/from_user/%d",
+    "about_topic": "/messages/about_topic/%d",
+}
 
 
 def merge_messages(messages, more_messages):
@@ -50,6 +73,38 @@ class MessagesAPI(object):
             stringify_booleans,
             none_filter,
         )
+        self._sinks = []
+        self._max_memory = None
+        self._spill_directory = None
+
+    def with_spill(self, max_memory=DEFAULT_MAX_MEMORY, directory=None):
+        """
+        Returns a MessagesAPI whose paged listings (``all``, ``from_group``,
+        etc.) move the messages they have fetched to a temporary file once
+        they take up more than ``max_memory`` bytes (measured as JSON).
+        ``directory`` is where the file is created, by default the system's
+        temporary directory.
+
+        The ``messages`` of a spilled result are a
+        :class:`yampy.spill.SpilledMessages` sequence that reads each message
+        from disk when it is accessed. Smaller results are returned as usual.
+        """
+        spilling = self._copy(self._client)
+        spilling._max_memory = max_memory
+        spilling._spill_directory = directory
+        return spilling
+
+    def with_fields(self, *paths):
+        """
+        Returns a MessagesAPI whose responses only keep the given fields of
+        each message, e.g. ``with_fields("sender_id", "body.plain")``. The
+        other fields are discarded while the response is parsed, which saves
+        memory and time on large backfills. See
+        :class:`yampy.models.Projection`.
+
+        The returned object shares this one's sinks and settings.
+        """
+        return self._copy(ProjectingClient(self._client, Projection(paths)))
 
     def all(self, older_than=None, newer_than=None,
             limit=None, threaded=None):
@@ -65,7 +120,8 @@ class MessagesAPI(object):
           each thread, or to ``"extended"`` to recieve the first and two newest
           messages from each thread.
         """
-        return self._get_paged_messages("/messages",
+        path = self._feed_path("all")
+        return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
                                         limit, threaded)
@@ -79,7 +135,8 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        return self._get_paged_messages("/messages/my_feed",
+        path = self._feed_path("from_my_feed")
+        return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
                                         limit, threaded)
@@ -91,7 +148,8 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        return self._get_paged_messages("/messages/algo",
+        path = self._feed_path("from_top_conversations")
+        return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
                                         limit, threaded)
@@ -104,7 +162,8 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        return self._get_paged_messages("/messages/following",
+        path = self._feed_path("from_followed_conversations")
+        return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
                                         limit, threaded)
@@ -116,7 +175,7 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        path = "/messages/in_group/%d" % extract_id(group_id)
+        path = self._feed_path("from_group", group_id)
         return self._get_paged_messages(path, older_than, newer_than,
                                         limit, threaded)
 
@@ -127,7 +186,8 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        return self._get_paged_messages("/messages/sent",
+        path = self._feed_path("sent")
+        return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
                                         limit, threaded)
@@ -139,7 +199,8 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        return self._get_paged_messages("/messages/private",
+        path = self._feed_path("private")
+        return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
                                         limit, threaded)
@@ -151,7 +212,8 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        return self._get_paged_messages("/messages/received",
+        path = self._feed_path("received")
+        return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
                                         limit, threaded)
@@ -163,7 +225,7 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        path = "/messages/in_thread/%d" % extract_id(thread_id)
+        path = self._feed_path("in_thread", thread_id)
         return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
@@ -176,7 +238,7 @@ class MessagesAPI(object):
 
         See the :meth:`all` method for a description of the keyword arguments.
         """
-        path = "/messages/from_user/%d" % extract_id(user_id)
+        path = self._feed_path("from_user", user_id)
         return self._get_paged_messages(path,
                                         older_than,
                                         newer_than,
@@ -186,7 +248,7 @@ class MessagesAPI(object):
         """
         Returns the messages about a topic
         """
-        path = "/messages/about_topic/%d" % extract_id(topic_id)
+        path = self._feed_path("about_topic", topic_id)
         return self._get_paged_messages(path,
                                         older_than=None,
                                         newer_than=None,
@@ -204,7 +266,8 @@ class MessagesAPI(object):
 
     def create(self, body, group_id=None, replied_to_id=None,
                direct_to_id=None, topics=[], broadcast=None,
-               open_graph_object={}, files=None):
+               open_graph_object={}, files=None, stream_files=False,
+               progress=None):
         """
         Posts a new message to Yammer. Returns the new message in the same
         format as the various message listing methods (:meth:`all`,
@@ -234,6 +297,12 @@ class MessagesAPI(object):
         * ``files`` -- A dict containing files to attach to the message.
           the keys shold be ``attachment1`` to ``attachment20``.  The values
           should be open file objects
+        * ``stream_files`` -- Set this to True to read the files from disk in
+          chunks as they are uploaded instead of buffering them in memory. The
+          values of ``files`` may then also be file paths.
+        * ``progress`` -- A callable that is called with the number of bytes
+          uploaded so far and the total after every chunk. Implies
+          ``stream_files``.
         """
         if len(topics) > 20:
             raise TooManyTopicsError("Too many topics, the maximum is 20")
@@ -241,6 +310,9 @@ class MessagesAPI(object):
         if len(open_graph_object) > 0 and "url" not in open_graph_object:
             raise InvalidOpenGraphObjectError("URL is required")
 
+        if files and (stream_files or progress is not None):
+            files = MultipartEncoder(files, progress=progress)
+
         return self._client.post("/messages", files=files,
             **self._argument_converter(
                 body=body,
@@ -289,6 +361,198 @@ class MessagesAPI(object):
             message_id=message_id,
         ))
 
+    def create_many(self, messages, max_workers=DEFAULT_MAX_WORKERS,
+                    progress=None):
+        """
+        Posts several messages, uploading their attachments concurrently.
+        Each item of ``messages`` is a dict of keyword arguments for
+        :meth:`create`. Attachments are streamed from disk.
+
+        ``progress`` is an optional callable that is called with the index of
+        a message, the number of bytes of it uploaded so far and its total
+        size.
+
+        Returns a :class:`yampy.concurrency.BulkReport` keyed by the index of
+        each message in ``messages``.
+        """
+        def create(item):
+            index, arguments = item
+            arguments = dict(arguments, stream_files=True)
+            if progress is not None:
+                arguments["progress"] = \
+                    lambda sent, total: progress(index, sent, total)
+            return self.create(**arguments)
+
+        return run_bulk(create, list(enumerate(messages)), max_workers,
+                        key=lambda item: item[0])
+
+    def delete_many(self, message_ids, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Deletes each of the messages identified by message_ids, making up to
+        ``max_workers`` requests at a time. Messages that no longer exist are
+        treated as deleted.
+
+        Returns a :class:`yampy.concurrency.BulkReport` keyed by message ID.
+        """
+        return run_bulk(self.delete, message_ids, max_workers,
+                        idempotent_errors=(NotFoundError,))
+
+    def like_many(self, message_ids, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        The current user likes each of the messages identified by
+        message_ids. See :meth:`delete_many` for details.
+        """
+        return run_bulk(self.like, message_ids, max_workers)
+
+    def unlike_many(self, message_ids, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Removes the current user's "like" from each of the messages identified
+        by message_ids. Messages that no longer exist are treated as unliked.
+        See :meth:`delete_many` for details.
+        """
+        return run_bulk(self.unlike, message_ids, max_workers,
+                        idempotent_errors=(NotFoundError,))
+
+    def email_many(self, message_ids, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Emails each of the messages identified by message_ids to the
+        authenticated user. See :meth:`delete_many` for details.
+        """
+        return run_bulk(self.email, message_ids, max_workers)
+
+    def iter_pages(self, feed, target_id=None, older_than=None,
+                   newer_than=None, limit=None, threaded=None, prefetch=0):
+        """
+        Lazily yields the pages of a message feed, newest first, only
+        requesting the next page when the previous one has been consumed.
+
+        ``feed`` is the name of one of the message listing methods, e.g.
+        ``"private"`` or ``"from_group"``. Feeds that belong to a group,
+        thread, user or topic also need its ``target_id``. See the :meth:`all`
+        method for a description of the other keyword arguments.
+
+        Set ``prefetch`` to a number of pages to fetch that many pages ahead
+        in a background thread while the current page is being processed.
+        """
+        pages = self._iter_pages(self._feed_path(feed, target_id),
+                                 older_than, newer_than, limit, threaded)
+        if prefetch:
+            pages = prefetch_iterator(pages, depth=prefetch)
+        return pages
+
+    def iter_messages(self, feed, target_id=None, older_than=None,
+                      newer_than=None, limit=None, threaded=None, prefetch=0):
+        """
+        Lazily yields the messages of a feed one at a time, newest first.
+
+        Takes the same arguments as :meth:`iter_pages`.
+        """
+        for page in self.iter_pages(feed, target_id, older_than, newer_than,
+                                    limit, threaded, prefetch):
+            for message in page.get("messages", ()):
+                yield message
+
+    def newest_message(self, feed, target_id=None, older_than=None):
+        """
+        Returns the newest message in a feed, or the newest one older than
+        the message ID ``older_than``, by requesting a single message. Returns
+        None if there is no such message.
+
+        This is a cheap probe for finding positions in a feed, so the response
+        is not passed to registered sinks.
+        """
+        page = self._client.get(
+            self._feed_path(feed, target_id),
+            **self._argument_converter(older_than=older_than, limit=1)
+        )
+        messages = page.get("messages")
+        return messages[0] if messages else None
+
+    def seek(self, feed, created_before, target_id=None):
+        """
+        Finds the position in a feed where messages become older than the
+        datetime ``created_before``, and returns it as a message ID to pass
+        as ``older_than`` to the listing methods. Returns None if every
+        message in the feed is older.
+
+        Message IDs increase with creation time, so the position is found by
+        galloping back from the newest message with single-message probes
+        and then binary searching, which takes a number of requests
+        logarithmic in the distance skipped rather than paging through it.
+        Naive datetimes are taken to be in UTC.
+        """
+        created_before = utc_datetime(created_before)
+
+        def is_before(older_than):
+            message = self.newest_message(feed, target_id, older_than)
+            if message is None:
+                return True, None
+            created_at = parse_timestamp(message["created_at"])
+            return created_at < created_before, message["id"]
+
+        before, newest_id = is_before(None)
+        if before:
+            return None
+
+        # Invariant: messages older than ``low`` were all created before
+        # ``created_before``, while those older than ``high`` were not.
+        high = newest_id + 1
+        step = 1
+        while True:
+            low = max(high - step, 1)
+            before, probed_id = is_before(low)
+            if before:
+                break
+            high = probed_id + 1
+            step *= 2
+
+        while high - low > 1:
+            middle = (low + high) // 2
+            before, probed_id = is_before(middle)
+            if before:
+                low = middle
+            else:
+                high = probed_id + 1
+        return low
+
+    def iter_created_between(self, feed, created_after=None,
+                             created_before=None, target_id=None,
+                             limit=None, threaded=None):
+        """
+        Lazily yields the messages in a feed created within
+        ``[created_after, created_before)``, newest first. Uses :meth:`seek`
+        to jump to ``created_before`` and stops paging at ``created_after``,
+        so only the requested window is downloaded. Either bound may be None.
+        """
+        older_than = None
+        if created_before is not None:
+            older_than = self.seek(feed, created_before, target_id)
+        if created_after is not None:
+            created_after = utc_datetime(created_after)
+
+        for message in self.iter_messages(feed, target_id, older_than,
+                                          limit=limit, threaded=threaded):
+            if created_after is not None and \
+                    parse_timestamp(message["created_at"]) < created_after:
+                return
+            yield message
+
+    def add_sink(self, sink):
+        """
+        Registers a ``sink`` that will be called with every page of messages
+        fetched by the message listing methods (:meth:`all`, :meth:`sent`,
+        etc.), e.g. the ``write_page`` method of a
+        :class:`yampy.archive.MessageArchiveWriter`.
+        """
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink):
+        """
+        Stops passing fetched pages to a ``sink`` registered with
+        :meth:`add_sink`.
+        """
+        self._sinks.remove(sink)
+
     def _get_paged_messages(self, path, older_than=None, newer_than=None,
                             limit=None, threaded=None):
         """
@@ -296,33 +560,68 @@ class MessagesAPI(object):
         'older_available', i.e. more pages to come.
         This method will page out all historical data.
         """
-        def _iter_messages(path, older_than=None, newer_than=None,
-                   limit=None, threaded=None):
-            messages = self._client.get(path, **self._argument_converter(
+        if self._max_memory is not None:
+            return self._get_spilled_messages(path, older_than, newer_than,
+                                              limit, threaded)
+        messages = None
+        try:
+            for page in self._iter_pages(path, older_than, newer_than,
+                                         limit, threaded):
+                messages = merge_messages(messages, page)
+        except DeadlineExceededError as e:
+            e.partial_result = messages
+            raise
+        return messages
+
+    def _get_spilled_messages(self, path, older_than, newer_than, limit,
+                              threaded):
+        merger = SpillingMerger(merge_messages, self._max_memory,
+                                self._spill_directory)
+        try:
+            for page in self._iter_pages(path, older_than, newer_than,
+                                         limit, threaded):
+                merger.add(page)
+        except DeadlineExceededError as e:
+            e.partial_result = merger.result()
+            raise
+        return merger.result()
+
+    def _copy(self, client):
+        copy = MessagesAPI(client=client)
+        copy._sinks = self._sinks
+        copy._max_memory = self._max_memory
+        copy._spill_directory = self._spill_directory
+        return copy
+
+    def _feed_path(self, feed, target_id=None):
+        try:
+            path = FEED_PATHS[feed]
+        except KeyError:
+            raise ValueError("Unknown message feed: %s" % feed)
+        if "%d" in path:
+            path = path % extract_id(target_id)
+        return path
+
+    def _iter_pages(self, path, older_than=None, newer_than=None,
+                    limit=None, threaded=None):
+        """
+        Yields each page of messages in turn, following the ``older_than``
+        cursor for as long as the API reports ``older_available``. Every page
+        is passed to the registered sinks before it is yielded.
+        """
+        are_more = True
+        while are_more:
+            page = self._client.get(path, **self._argument_converter(
                 older_than=older_than,
                 newer_than=newer_than,
                 limit=limit,
                 threaded=threaded,
             ))
+            for sink in self._sinks:
+                sink(page)
+            yield page
             try:
-                older_available = messages['meta']['older_available']
-                return (older_available,
-                    messages,
-                    messages['messages'][-1:][0]['id'])
-            except KeyError:
-                return (False,
-                    messages,
-                    None)
-            
-        are_more = True
-        messages = None
-        while are_more:
-            are_more, more_messages, last_message = _iter_messages(
-                path,
-                older_than,
-                newer_than,
-                limit,
-                threaded)
-            older_than = last_message
-            messages = merge_messages(messages, more_messages)
-        return messages
+                are_more = page['meta']['older_available']
+                older_than = page['messages'][-1]['id']
+            except (KeyError, IndexError):
+                are_more = False
@@ -15,11 +15,12 @@
 # See the Apache Version 2.0 License for specific language governing
 # permissions and limitations under the License.
 
-from yampy.apis.utils import ArgumentConverter, flatten_dicts, \
-                             stringify_booleans, none_filter
+from yampy.apis.utils import ArgumentConverter, ProjectingClient, \
+                             flatten_dicts, stringify_booleans, none_filter
 from yampy.errors import InvalidEducationRecordError, \
                          InvalidPreviousCompanyRecord
-from yampy.models import extract_id
+from yampy.models import Projection, extract_id
+from yampy.prefetch import DEFAULT_DEPTH, iter_numbered_pages
 
 
 def education_argument_converter(arguments):
@@ -81,6 +82,15 @@ class UsersAPI(object):
             none_filter,
         )
 
+    def with_fields(self, *paths):
+        """
+        Returns a UsersAPI whose responses only keep the given fields of each
+        user, e.g. ``with_fields("full_name", "contact.email_addresses")``.
+        See :class:`yampy.models.Projection`.
+        """
+        return UsersAPI(
+            client=ProjectingClient(self._client, Projection(paths)))
+
     def all(self, page=None, letter=None, sort_by=None, reverse=None):
         """
         Returns all the users in the current user's network.
@@ -113,6 +123,33 @@ class UsersAPI(object):
             page=page,
         ))
 
+    def iter_all(self, letter=None, sort_by=None, reverse=None,
+                 prefetch=DEFAULT_DEPTH):
+        """
+        Yields every page of users in the current user's network, requesting
+        the next ``prefetch`` pages in the background while each page is
+        being processed.
+
+        See the :meth:`all` method for a description of the other keyword
+        arguments.
+        """
+        return iter_numbered_pages(
+            lambda page: self.all(page=page, letter=letter, sort_by=sort_by,
+                                  reverse=reverse),
+            depth=prefetch,
+        )
+
+    def iter_in_group(self, group_id, prefetch=DEFAULT_DEPTH):
+        """
+        Yields every page of users belonging to the group identified by the
+        given group_id, requesting the next ``prefetch`` pages in the
+        background while each page is being processed.
+        """
+        return iter_numbered_pages(
+            lambda page: self.in_group(group_id, page=page),
+            depth=prefetch,
+        )
+
     def find_current(self, include_group_memberships=None,
                      include_followed_users=None, include_followed_tags=None):
         """
@@ -149,3 +149,27 @@ class ArgumentConverter(object):
         for converter in self._converters:
             converted_args = converter(converted_args)
         return converted_args
+
+
+class ProjectingClient(object):
+    """
+    Wraps a client so that the responses to every request are parsed with a
+    :class:`yampy.models.Projection`.
+    """
+
+    def __init__(self, client, projection):
+        self._client = client
+        self._projection = projection
+
+    def get(self, path, **kwargs):
+        return self._client.get(path, projection=self._projection, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self._client.post(path, projection=self._projection, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self._client.put(path, projection=self._projection, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self._client.delete(path, projection=self._projection,
+                                   **kwargs)
@@ -0,0 +1,285 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+"""
+A compressed archive format for cold storage of message history.
+
+An archive is a file of independently compressed frames, each holding one
+page of messages as JSON lines, plus a sidecar ``.idx`` file that maps
+message ids, thread ids and ``created_at`` timestamps to frames. Looking up a
+single message or thread only decompresses the frames that contain it.
+"""
+
+from bisect import bisect_left, bisect_right
+import json
+import os
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from .models import GenericModel, extract_id
+
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+
+def _compressor(codec):
+    if codec == GZIP:
+        def compress(data):
+            # wbits=31 writes gzip members, so an archive is also a valid
+            # (multi-member) .gz file that zcat can read.
+            compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+            return compressor.compress(data) + compressor.flush()
+        return compress
+    elif codec == ZSTD:
+        return zstandard.ZstdCompressor().compress
+    raise ValueError("Unknown archive codec: %s" % codec)
+
+
+def _decompressor(codec):
+    if codec == GZIP:
+        return lambda data: zlib.decompress(data, 31)
+    elif codec == ZSTD:
+        return zstandard.ZstdDecompressor().decompress
+    raise ValueError("Unknown archive codec: %s" % codec)
+
+
+def _check_codec(codec):
+    if codec == ZSTD and zstandard is None:
+        raise ValueError("The zstandard package is required for zstd archives")
+
+
+def index_path(path):
+    """
+    Returns the path of the sidecar index for the archive at ``path``.
+    """
+    return path + ".idx"
+
+
+class MessageArchiveWriter(object):
+    """
+    Appends pages of messages to an archive file.
+
+    A writer can be registered as a sink on a
+    :class:`yampy.apis.MessagesAPI` so that every page it fetches is
+    archived::
+
+        with MessageArchiveWriter("history.jsonl.gz") as archive:
+            yammer.messages.add_sink(archive.write_page)
+            yammer.messages.all()
+    """
+
+    def __init__(self, path, codec=GZIP):
+        """
+        Opens the archive at ``path`` for appending, creating it if it does
+        not exist. ``codec`` is either ``"gzip"`` (the default) or ``"zstd"``,
+        which requires the ``zstandard`` package. An existing archive keeps
+        the codec it was created with.
+        """
+        self._path = path
+        self._index = _load_index(path) or _empty_index(codec)
+        _check_codec(self._index["codec"])
+        self._compress = _compressor(self._index["codec"])
+        self._file = open(path, "ab")
+        self._file.seek(0, os.SEEK_END)
+
+    def write_page(self, page):
+        """
+        Appends the messages and references of a page returned by one of the
+        message listing methods. Messages that are already in the archive are
+        skipped. Responses without messages are ignored.
+        """
+        index = self._index
+        messages = [m for m in page.get("messages", ())
+                    if str(m["id"]) not in index["messages"]]
+        if messages:
+            frame = self._write_frame(messages)
+            for message in messages:
+                index["messages"][str(message["id"])] = frame
+                thread_id = message.get("thread_id")
+                if thread_id is not None:
+                    frames = index["threads"].setdefault(str(thread_id), [])
+                    if frame not in frames:
+                        frames.append(frame)
+                created_at = message.get("created_at")
+                if created_at is not None:
+                    self._insert_created_at(created_at, message["id"])
+
+        references = page.get("references")
+        if references:
+            index["references"].append(self._write_frame(references))
+
+    def flush(self):
+        """
+        Flushes written frames to disk and rewrites the sidecar index.
+        """
+        self._file.flush()
+        with open(index_path(self._path), "w") as index_file:
+            json.dump(self._index, index_file)
+
+    def close(self):
+        """
+        Flushes and closes the archive.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_frame(self, items):
+        # default=dict serializes CompactModels parsed in compact mode.
+        lines = "".join(json.dumps(item, default=dict) + "\n"
+                        for item in items)
+        data = self._compress(lines.encode("utf-8"))
+        offset = self._file.tell()
+        self._file.write(data)
+        self._index["frames"].append([offset, len(data)])
+        return len(self._index["frames"]) - 1
+
+    def _insert_created_at(self, created_at, message_id):
+        entries = self._index["created_at"]
+        entry = [created_at, message_id]
+        entries.insert(bisect_right(entries, entry), entry)
+
+
+class MessageArchiveReader(object):
+    """
+    Provides random access to the messages in an archive. Messages are
+    returned as :class:`yampy.models.GenericModel` instances and frames are
+    only decompressed when a message in them is requested.
+    """
+
+    def __init__(self, path):
+        """
+        Opens the archive at ``path``, which must have a sidecar index.
+        """
+        self._path = path
+        self._index = _load_index(path)
+        if self._index is None:
+            raise ValueError("No archive index found for %s" % path)
+        _check_codec(self._index["codec"])
+        self._decompress = _decompressor(self._index["codec"])
+        self._file = open(path, "rb")
+        self._cached_frame = (None, None)
+
+    def __len__(self):
+        return len(self._index["messages"])
+
+    def __contains__(self, message_id):
+        return str(extract_id(message_id)) in self._index["messages"]
+
+    def find(self, message_id):
+        """
+        Returns the message identified by ``message_id``, or None if it is not
+        in the archive.
+        """
+        message_id = extract_id(message_id)
+        frame = self._index["messages"].get(str(message_id))
+        if frame is None:
+            return None
+        for message in self._read_frame(frame):
+            if message.id == message_id:
+                return message
+
+    def in_thread(self, thread_id):
+        """
+        Yields the archived messages that belong to the thread identified by
+        ``thread_id``.
+        """
+        thread_id = extract_id(thread_id)
+        for frame in self._index["threads"].get(str(thread_id), ()):
+            for message in self._read_frame(frame):
+                if message.get("thread_id") == thread_id:
+                    yield message
+
+    def created_between(self, start=None, end=None):
+        """
+        Yields the archived messages whose ``created_at`` is within
+        ``[start, end)``, oldest first. Timestamps are compared as the strings
+        the API returns them as. Either bound may be None.
+        """
+        entries = self._index["created_at"]
+        low = 0 if start is None else bisect_left(entries, [start])
+        high = len(entries) if end is None else bisect_left(entries, [end])
+        for created_at, message_id in entries[low:high]:
+            yield self.find(message_id)
+
+    def __iter__(self):
+        """
+        Yields every archived message, in the order they were written.
+        """
+        frames = sorted(set(self._index["messages"].values()))
+        for frame in frames:
+            for message in self._read_frame(frame):
+                yield message
+
+    def references(self):
+        """
+        Yields the archived references (users, groups, threads, etc.).
+        """
+        for frame in self._index["references"]:
+            for reference in self._read_frame(frame):
+                yield reference
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read_frame(self, frame):
+        cached_frame, items = self._cached_frame
+        if cached_frame != frame:
+            offset, length = self._index["frames"][frame]
+            self._file.seek(offset)
+            data = self._decompress(self._file.read(length)).decode("utf-8")
+            items = [GenericModel.from_json(line)
+                     for line in data.splitlines() if line]
+            self._cached_frame = (frame, items)
+        return items
+
+
+def _empty_index(codec):
+    _check_codec(codec)
+    return {
+        "codec": codec,
+        "frames": [],
+        "messages": {},
+        "threads": {},
+        "created_at": [],
+        "references": [],
+    }
+
+
+def _load_index(path):
+    try:
+        with open(index_path(path)) as index_file:
+            return json.load(index_file)
+    except IOError:
+        return None
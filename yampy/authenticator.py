@@ -20,9 +20,20 @@ try:
 except ImportError:
     from urllib import urlencode        # Python 2
 
-from .constants import DEFAULT_OAUTH_BASE_URL, DEFAULT_OAUTH_DIALOG_URL
+import json
+
+import requests
+
+from .constants import DEFAULT_BASE_URL, DEFAULT_OAUTH_BASE_URL, \
+    DEFAULT_OAUTH_DIALOG_URL
 from .client import Client
-from .errors import ResponseError
+from .errors import InvalidAccessTokenError, ResponseError, \
+    UnauthorizedError
+from .models import GenericModel
+from .token_store import MemoryTokenStore
+
+
+DEFAULT_TOKEN_TTL = 300
 
 
 class Authenticator(object):
@@ -40,7 +51,8 @@ class Authenticator(object):
     """
 
     def __init__(self, client_id, client_secret,
-                 oauth_dialog_url=None, oauth_base_url=None, proxies=None):
+                 oauth_dialog_url=None, oauth_base_url=None, proxies=None,
+                 base_url=None, token_store=None, token_ttl=DEFAULT_TOKEN_TTL):
         """
         Initializes a new Authenticator. The client_id and client_secret
         identify your application, you acquire them when registering your
@@ -55,12 +67,26 @@ class Authenticator(object):
         * ``oauth_base_url`` -- The base URL for OAuth API requests, e.g. token
           exchange. Used by ``fetch_access_data`` or ``fetch_access_token``.
         * ``proxies`` -- provide a proxies dictionary to be used by the client.
+        * ``base_url`` -- The base URL of the REST API, used to look up the
+          user an access token belongs to.
+
+        Exchanged tokens, the users they belong to and whether they are
+        valid are cached in ``token_store`` for ``token_ttl`` seconds. It
+        defaults to a :class:`yampy.token_store.MemoryTokenStore`. All
+        requests share one pooled connection per host.
         """
         self._client_id = client_id
         self._client_secret = client_secret
         self._oauth_dialog_url = oauth_dialog_url or DEFAULT_OAUTH_DIALOG_URL
         self._oauth_base_url = oauth_base_url or DEFAULT_OAUTH_BASE_URL
+        self._base_url = base_url or DEFAULT_BASE_URL
         self._proxies = proxies
+        self._token_store = token_store if token_store is not None \
+            else MemoryTokenStore()
+        self._token_ttl = token_ttl
+        self._session = requests.Session()
+        self._client = Client(base_url=self._oauth_base_url, proxies=proxies,
+                              session=self._session)
 
     def authorization_url(self, redirect_uri):
         """
@@ -84,14 +110,27 @@ class Authenticator(object):
 
         If you only intend to make use of the token, you can use the
         ``fetch_access_token`` method instead for convenience.
+
+        Repeating the exchange for the same code returns the cached response.
         """
-        client = Client(base_url=self._oauth_base_url, proxies=self._proxies)
-        return client.get(
+        cached = self._token_store.get("code:%s" % code)
+        if cached is not None:
+            return GenericModel.from_json(json.dumps(cached))
+
+        access_data = self._client.get(
             path="/access_token",
             client_id=self._client_id,
             client_secret=self._client_secret,
             code=code,
         )
+        self._token_store.set("code:%s" % code, access_data, self._token_ttl)
+        try:
+            token = access_data.access_token.token
+        except AttributeError:
+            return access_data
+        if "user" in access_data:
+            self._cache_token(token, access_data.user)
+        return access_data
 
     def fetch_access_token(self, code):
         """
@@ -107,3 +146,50 @@ class Authenticator(object):
             return access_data.access_token.token
         except AttributeError:
             raise ResponseError("Unexpected response format")
+
+    def user_for_token(self, token):
+        """
+        Returns the user that the access token ``token`` belongs to, from the
+        token store if possible and from the API's ``/users/current``
+        endpoint otherwise.
+
+        Raises :class:`yampy.errors.InvalidAccessTokenError` or
+        :class:`yampy.errors.UnauthorizedError` if the token is not valid.
+        """
+        cached = self._token_store.get("token:%s" % token)
+        if cached is not None:
+            if cached.get("user") is None:
+                raise InvalidAccessTokenError("Cached invalid access token")
+            return GenericModel.from_json(json.dumps(cached["user"]))
+
+        client = Client(access_token=token, base_url=self._base_url,
+                        proxies=self._proxies, session=self._session)
+        try:
+            user = client.get("/users/current")
+        except (InvalidAccessTokenError, UnauthorizedError):
+            self._cache_token(token, None)
+            raise
+        self._cache_token(token, user)
+        return user
+
+    def is_valid_token(self, token):
+        """
+        Returns True if the access token ``token`` is valid. The result is
+        cached, so repeated checks don't make a request each time.
+        """
+        try:
+            self.user_for_token(token)
+        except (InvalidAccessTokenError, UnauthorizedError):
+            return False
+        return True
+
+    def forget_token(self, token):
+        """
+        Removes everything cached about the access token ``token``, e.g.
+        when the user logs out or revokes it.
+        """
+        self._token_store.delete("token:%s" % token)
+
+    def _cache_token(self, token, user):
+        self._token_store.set("token:%s" % token, {"user": user},
+                              self._token_ttl)
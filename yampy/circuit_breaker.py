@@ -0,0 +1,170 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Circuit breakers that stop requests to failing endpoints.
+"""
+
+import threading
+import time
+
+from .errors import CircuitOpenError
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+class CircuitBreaker(object):
+    """
+    Keeps a circuit per path template (e.g. ``/users/:id``) and stops calls
+    to endpoints that keep failing.
+
+    A circuit opens after ``failure_threshold`` consecutive failures, where
+    a failure is an exception such as a connection error or timeout, a 5xx
+    response, or a response slower than ``slow_threshold`` seconds (if
+    given). While it is open calls fail immediately with a
+    :class:`yampy.errors.CircuitOpenError`. After ``reset_timeout`` seconds
+    the circuit is half open and lets ``half_open_probes`` calls through: a
+    success closes it again and a failure reopens it.
+
+    Pass one to :class:`yampy.client.Client` (or :class:`yampy.Yammer`)::
+
+        breaker = CircuitBreaker(failure_threshold=3, slow_threshold=10)
+        yammer = Yammer(access_token=token, circuit_breaker=breaker)
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 slow_threshold=None, reset_timeout=DEFAULT_RESET_TIMEOUT,
+                 half_open_probes=1, clock=time.time):
+        self._failure_threshold = failure_threshold
+        self._slow_threshold = slow_threshold
+        self._reset_timeout = reset_timeout
+        self._half_open_probes = half_open_probes
+        self._clock = clock
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def call(self, template, send):
+        """
+        Calls ``send`` unless the circuit for ``template`` is open, records
+        the outcome and returns the response.
+        """
+        self._before(template)
+        started = self._clock()
+        try:
+            response = send()
+        except Exception:
+            self._record(template, False)
+            raise
+        elapsed = self._clock() - started
+        slow = (self._slow_threshold is not None
+                and elapsed > self._slow_threshold)
+        self._record(template, response.status_code < 500 and not slow)
+        return response
+
+    def state(self, template):
+        """
+        Returns the state of the circuit for ``template``: ``"closed"``,
+        ``"open"`` or ``"half_open"``.
+        """
+        with self._lock:
+            circuit = self._circuits.get(template)
+            if circuit is None:
+                return CLOSED
+            return self._current_state(circuit)
+
+    def metrics(self):
+        """
+        Returns a dict that maps each path template to the state of its
+        circuit, its count of consecutive failures, and the number of times
+        it has opened and calls it has rejected.
+        """
+        with self._lock:
+            return dict(
+                (template, {
+                    "state": self._current_state(circuit),
+                    "consecutive_failures": circuit.consecutive_failures,
+                    "opened": circuit.opened,
+                    "rejected": circuit.rejected,
+                })
+                for template, circuit in self._circuits.items()
+            )
+
+    def reset(self, template=None):
+        """
+        Closes the circuit for ``template``, or every circuit.
+        """
+        with self._lock:
+            if template is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(template, None)
+
+    def _before(self, template):
+        with self._lock:
+            circuit = self._circuits.get(template)
+            if circuit is None:
+                circuit = self._circuits[template] = _Circuit()
+            state = self._current_state(circuit)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and circuit.probes < self._half_open_probes:
+                circuit.probes += 1
+                return
+            circuit.rejected += 1
+        raise CircuitOpenError("Circuit open for %s" % template)
+
+    def _record(self, template, succeeded):
+        with self._lock:
+            circuit = self._circuits.get(template)
+            if circuit is None:
+                return
+            if succeeded:
+                circuit.consecutive_failures = 0
+                circuit.opened_at = None
+                circuit.probes = 0
+                return
+            circuit.consecutive_failures += 1
+            half_open = self._current_state(circuit) == HALF_OPEN
+            if (half_open or
+                    circuit.consecutive_failures >= self._failure_threshold):
+                if circuit.opened_at is None or half_open:
+                    circuit.opened += 1
+                circuit.opened_at = self._clock()
+                circuit.probes = 0
+
+    def _current_state(self, circuit):
+        if circuit.opened_at is None:
+            return CLOSED
+        if self._clock() - circuit.opened_at >= self._reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+
+class _Circuit(object):
+    def __init__(self):
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probes = 0
+        self.opened = 0
+        self.rejected = 0
@@ -23,9 +23,23 @@ except ImportError:
     HAS_REQUESTS = False
 
 from .constants import DEFAULT_BASE_URL
+from .deadline import current_deadline, timeout_within_deadline
 from .errors import ResponseError, NotFoundError, InvalidAccessTokenError, \
-    RateLimitExceededError, UnauthorizedError
+    RateLimitExceededError, UnauthorizedError, DeadlineExceededError
 from .models import GenericModel
+from .multipart import MultipartEncoder
+from .scheduler import current_priority
+from .transports import RequestsTransport
+
+
+def path_template(path):
+    """
+    Returns ``path`` with its numeric segments replaced by ``:id``, e.g.
+    ``/users/123`` becomes ``/users/:id``, so that requests to the same
+    endpoint can be grouped together.
+    """
+    return "/".join(":id" if segment.isdigit() else segment
+                    for segment in path.split("/"))
 
 
 class Client(object):
@@ -33,15 +47,65 @@ class Client(object):
     A client for the Yammer API.
     """
 
-    def __init__(self, access_token=None, base_url=None, proxies=None):
+    def __init__(self, access_token=None, base_url=None, proxies=None,
+                 rate_limiter=None, session=None, hedging=None,
+                 circuit_breaker=None, transport=None, timeout=None,
+                 scheduler=None, compact_models=False):
+        """
+        Initializes a new Client.
+
+        * ``rate_limiter`` -- an optional
+          :class:`yampy.concurrency.RateLimiter` that every request must
+          acquire a token from before it is sent. Share one between clients
+          that use the same access token.
+        * ``session`` -- an optional ``requests.Session`` to send requests
+          through, so that connections are kept alive and reused. It can be
+          shared between clients. Without one, every request opens a new
+          connection.
+        * ``hedging`` -- an optional :class:`yampy.hedging.HedgingPolicy`.
+          GET requests that are slower than usual for their endpoint are
+          then sent a second time, and the first response is used.
+        * ``circuit_breaker`` -- an optional
+          :class:`yampy.circuit_breaker.CircuitBreaker`. Requests to an
+          endpoint that keeps failing then raise
+          :class:`yampy.errors.CircuitOpenError` without being sent.
+        * ``transport`` -- the object that sends requests, e.g. a
+          :class:`yampy.transports.Urllib3Transport` or
+          :class:`yampy.transports.HttpxTransport`. Defaults to a
+          :class:`yampy.transports.RequestsTransport` that uses ``session``.
+        * ``timeout`` -- the default timeout of each request, either a number
+          of seconds or a ``(connect, read)`` tuple. Without one, requests
+          wait for as long as the connection stays open. It can be
+          overridden per call with a ``timeout`` keyword argument.
+        * ``scheduler`` -- an optional
+          :class:`yampy.scheduler.RequestScheduler` that decides the order in
+          which requests of different priority classes are sent.
+        * ``compact_models`` -- parse responses in compact mode, see
+          :meth:`yampy.models.GenericModel.from_json`. Use it when keeping
+          large numbers of messages or users in memory.
+
+        Inside a :func:`yampy.deadline.deadline` block, timeouts are
+        shortened to the time left, and requests raise
+        :class:`yampy.errors.DeadlineExceededError` once it has run out.
+        """
         self._access_token = access_token
         self._base_url = base_url or DEFAULT_BASE_URL
         self._proxies = proxies
+        self._rate_limiter = rate_limiter
+        self._transport = transport or RequestsTransport(session)
+        self._hedging = hedging
+        self._circuit_breaker = circuit_breaker
+        self._timeout = timeout
+        self._scheduler = scheduler
+        self._compact_models = compact_models
 
     def get(self, path, **kwargs):
         """
         Makes an HTTP GET request to the Yammer API. Any keyword arguments will
-        be converted to query string parameters.
+        be converted to query string parameters, except for ``timeout``, which
+        overrides the client's default timeout for this request, and
+        ``projection``, a :class:`yampy.models.Projection` of the fields to
+        keep from the response.
 
         The path should be the path of an API endpoint, e.g. "/messages"
         """
@@ -52,6 +116,10 @@ class Client(object):
         Makes an HTTP POST request to the Yammer API. Any keyword arguments
         will be sent as the body of the request.
 
+        Attachments can be given as a ``files`` dict, which is buffered in
+        memory, or as a :class:`yampy.multipart.MultipartEncoder`, which is
+        streamed.
+
         The path should be the path of an API endpoint, e.g. "/messages"
         """
         return self._request("post", path, **kwargs)
@@ -74,7 +142,8 @@ class Client(object):
         return self._request("delete", path, **kwargs)
 
     def request(self, method, path, **kwargs):
-        return requests.request(
+        self._wait_for_rate_limit()
+        return self._send(
             method=method,
             url=path,
             headers=self._build_headers(),
@@ -83,18 +152,80 @@ class Client(object):
         )
 
     def _request(self, method, path, **kwargs):
-        if 'files' in kwargs:
+        if 'files' in kwargs or 'timeout' in kwargs or 'projection' in kwargs:
             kwargs = kwargs.copy()
         files = kwargs.pop('files', None)
-        response = requests.request(
+        timeout = kwargs.pop('timeout', self._timeout)
+        projection = kwargs.pop('projection', None)
+        headers = self._build_headers()
+        if isinstance(files, MultipartEncoder):
+            headers["Content-Type"] = files.content_type
+            body = {"data": files}
+        else:
+            body = {"files": files}
+        request = dict(
             method=method,
             url=self._build_url(path),
-            headers=self._build_headers(),
+            headers=headers,
             proxies=self._proxies,
             params=kwargs,
-            files=files,
+            **body
         )
-        return self._parse_response(response)
+        template = path_template(path)
+        if self._scheduler is None:
+            return self._send_when_allowed(template, request, timeout,
+                                           projection)
+        active = current_deadline()
+        if not self._scheduler.acquire(
+                current_priority(),
+                timeout=None if active is None else active.remaining()):
+            raise DeadlineExceededError("Deadline exceeded")
+        try:
+            return self._send_when_allowed(template, request, timeout,
+                                           projection)
+        finally:
+            self._scheduler.release()
+
+    def _send_when_allowed(self, template, request, timeout, projection):
+        self._wait_for_rate_limit()
+        timeout = timeout_within_deadline(timeout)
+        if timeout is not None:
+            request["timeout"] = timeout
+        try:
+            if self._circuit_breaker is not None:
+                response = self._circuit_breaker.call(
+                    template, lambda: self._send_request(template, request))
+            else:
+                response = self._send_request(template, request)
+        except ResponseError:
+            raise
+        except Exception:
+            # A request that timed out because the deadline ran out.
+            active = current_deadline()
+            if active is not None and active.expired():
+                raise DeadlineExceededError("Deadline exceeded")
+            raise
+        return self._parse_response(response, projection)
+
+    def _send_request(self, template, request):
+        if request["method"] == "get" and self._hedging is not None:
+            return self._hedging.call(
+                template,
+                lambda: self._send(**request),
+                lambda: self._send_hedge(request),
+            )
+        return self._send(**request)
+
+    def _send(self, **kwargs):
+        return self._transport.send(**kwargs)
+
+    def _send_hedge(self, request):
+        self._wait_for_rate_limit()
+        return self._send(**request)
+
+    def _wait_for_rate_limit(self):
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
 
     def _build_url(self, path):
         return self._base_url + path + ".json"
@@ -107,15 +238,16 @@ class Client(object):
         else:
             return {}
 
-    def _parse_response(self, response):
+    def _parse_response(self, response, projection=None):
         if 200 <= response.status_code < 300:
-            return self._value_for_response(response)
+            return self._value_for_response(response, projection)
         else:
             raise self._exception_for_response(response)
 
-    def _value_for_response(self, response):
+    def _value_for_response(self, response, projection=None):
         if response.text.strip():
-            return GenericModel.from_json(response.text)
+            return GenericModel.from_json(response.text, projection,
+                                          self._compact_models)
         else:
             return True
 
@@ -0,0 +1,144 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Helpers for making many API requests concurrently without exceeding the
+API's rate limits.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from .deadline import bind, current_deadline
+from .errors import RateLimitExceededError
+from .models import extract_id
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class RateLimiter(object):
+    """
+    A thread-safe token bucket that allows ``rate`` requests every ``per``
+    seconds, with bursts of up to ``burst`` requests (``rate`` by default).
+
+    Pass one to :class:`yampy.client.Client` to limit every request it makes.
+    """
+
+    def __init__(self, rate, per=1.0, burst=None, clock=time.time,
+                 sleep=time.sleep):
+        self._rate = float(rate) / per
+        self._capacity = float(burst or rate)
+        self._tokens = self._capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Takes a token from the bucket, blocking until one is available.
+        """
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._updated_at) * self._rate,
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            self._sleep(wait)
+
+
+class BulkReport(object):
+    """
+    The outcome of a bulk operation, keyed by the id of each item.
+
+    * ``succeeded`` -- A dict mapping ids to the API's response.
+    * ``failed`` -- A dict mapping ids to the exception that was raised.
+    """
+
+    def __init__(self):
+        self.succeeded = {}
+        self.failed = {}
+
+    @property
+    def ok(self):
+        """
+        True if every item succeeded.
+        """
+        return not self.failed
+
+    def __len__(self):
+        return len(self.succeeded) + len(self.failed)
+
+    def __repr__(self):
+        return "<BulkReport succeeded=%d failed=%d>" % (
+            len(self.succeeded), len(self.failed),
+        )
+
+
+def run_bulk(func, items, max_workers=DEFAULT_MAX_WORKERS,
+             idempotent_errors=(), retries=3, backoff=1.0, sleep=time.sleep,
+             key=extract_id):
+    """
+    Calls ``func`` with each of ``items`` on a pool of ``max_workers`` threads
+    and returns a :class:`BulkReport` keyed by the id of each item, or by the
+    result of calling ``key`` with it.
+
+    Exceptions listed in ``idempotent_errors`` count as successes (with a
+    response of None), e.g. a ``NotFoundError`` when deleting something that
+    has already been deleted. Calls rejected with a
+    ``RateLimitExceededError`` are retried up to ``retries`` times, waiting
+    ``backoff`` seconds and doubling the wait after each attempt, unless the
+    wait would outlast the current :func:`yampy.deadline.deadline`. Calls
+    run under the caller's deadline.
+    """
+    def call(item):
+        for attempt in range(retries + 1):
+            try:
+                return func(item)
+            except RateLimitExceededError:
+                wait = backoff * 2 ** attempt
+                active = current_deadline()
+                if attempt == retries or \
+                        (active is not None and active.remaining() < wait):
+                    raise
+                sleep(wait)
+
+    report = BulkReport()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        call = bind(call)
+        futures = [(key(item), executor.submit(call, item))
+                   for item in items]
+        for item_id, future in futures:
+            try:
+                report.succeeded[item_id] = future.result()
+            except idempotent_errors:
+                report.succeeded[item_id] = None
+            except Exception as e:
+                report.failed[item_id] = e
+    finally:
+        executor.shutdown(wait=True)
+    return report
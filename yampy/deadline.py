@@ -0,0 +1,141 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Deadlines that bound the total time spent on a block of API calls.
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+
+from .errors import DeadlineExceededError
+from .scheduler import current_priority, priority
+
+
+_local = threading.local()
+
+
+class Deadline(object):
+    """
+    A point in time by which a block of work must be finished.
+    """
+
+    def __init__(self, seconds, clock=time.time):
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self):
+        """
+        Returns the number of seconds left, which is never negative.
+        """
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """
+        Raises a :class:`yampy.errors.DeadlineExceededError` if the deadline
+        has passed.
+        """
+        if self.expired():
+            raise DeadlineExceededError("Deadline exceeded")
+
+
+def current_deadline():
+    """
+    Returns the innermost active :class:`Deadline` of the current thread, or
+    None.
+    """
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def deadline(seconds, clock=time.time):
+    """
+    Returns a context manager that limits every request made in its block,
+    on the current thread, to finish within ``seconds`` in total. Nested
+    deadlines can only shorten the time that is left.
+    """
+    new = Deadline(seconds, clock)
+    outer = current_deadline()
+    if outer is not None and outer.expires_at < new.expires_at:
+        new = outer
+    with _activate(new):
+        yield new
+
+
+def bind(func):
+    """
+    Returns a wrapper that calls ``func`` under the current thread's
+    deadline and request priority, for handing work to other threads.
+    """
+    active = current_deadline()
+    name = current_priority()
+    if active is None and name is None:
+        return func
+
+    def call(*args, **kwargs):
+        with _activate(active), _prioritize(name):
+            return func(*args, **kwargs)
+    return call
+
+
+def timeout_within_deadline(timeout):
+    """
+    Returns ``timeout``, either None, a number of seconds or a ``(connect,
+    read)`` tuple, shortened to fit in the current deadline. Raises a
+    :class:`yampy.errors.DeadlineExceededError` if the deadline has passed.
+    """
+    active = current_deadline()
+    if active is None:
+        return timeout
+    active.check()
+    remaining = active.remaining()
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining)
+                     for part in timeout)
+    return min(timeout, remaining)
+
+
+@contextmanager
+def _prioritize(name):
+    if name is None:
+        yield
+    else:
+        with priority(name):
+            yield
+
+
+@contextmanager
+def _activate(active):
+    if active is None:
+        yield
+        return
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(active)
+    try:
+        yield active
+    finally:
+        stack.pop()
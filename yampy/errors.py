@@ -58,6 +58,23 @@ class RateLimitExceededError(ResponseError):
     pass
 
 
+class CircuitOpenError(ResponseError):
+    """
+    Raised without making a request when a circuit breaker has stopped
+    requests to an endpoint that has been failing or responding slowly.
+    """
+    pass
+
+
+class DeadlineExceededError(ResponseError):
+    """
+    Raised instead of making a request when the deadline set with
+    :meth:`yampy.Yammer.deadline` has passed. When a paged listing runs out
+    of time, the pages fetched so far are merged into ``partial_result``.
+    """
+    partial_result = None
+
+
 class InvalidMessageError(Exception):
     """
     Super class for the various kinds of errors that can occur when creating
@@ -0,0 +1,158 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Hedged requests, which trade a little extra load for lower tail latency.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import threading
+import time
+
+
+DEFAULT_PERCENTILE = 95
+DEFAULT_WINDOW = 200
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_BUDGET = 0.05
+DEFAULT_MAX_WORKERS = 8
+
+
+class HedgingPolicy(object):
+    """
+    Decides when to send a duplicate of a slow, idempotent request.
+
+    The policy keeps the latencies of the last ``window`` requests for each
+    path template (e.g. ``/users/:id``). Once it has ``min_samples`` of them,
+    a request that has not completed within the ``percentile``-th percentile
+    of those latencies is sent a second time, and whichever response arrives
+    first is used. Each request earns ``budget`` hedges, so no more than
+    about ``budget`` of all requests (5% by default) are duplicated.
+
+    Pass one to :class:`yampy.client.Client` (or :class:`yampy.Yammer`) to
+    hedge its GET requests::
+
+        yammer = Yammer(access_token=token, hedging=HedgingPolicy())
+    """
+
+    def __init__(self, percentile=DEFAULT_PERCENTILE, window=DEFAULT_WINDOW,
+                 min_samples=DEFAULT_MIN_SAMPLES, budget=DEFAULT_BUDGET,
+                 max_workers=DEFAULT_MAX_WORKERS, clock=time.time):
+        self._percentile = percentile
+        self._window = window
+        self._min_samples = min_samples
+        self._budget = budget
+        # Allow a few hedges to accumulate so that a burst of slow responses
+        # can be hedged, but no more than that.
+        self._max_tokens = max(1.0, budget * window)
+        self._tokens = 0.0
+        self._latencies = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.hedged = 0
+
+    def delay_for(self, template):
+        """
+        Returns how many seconds to wait for a request to ``template`` before
+        hedging it, or None if too few of its latencies have been recorded.
+        """
+        with self._lock:
+            latencies = self._latencies.get(template)
+            if latencies is None or len(latencies) < self._min_samples:
+                return None
+            ordered = sorted(latencies)
+        rank = int(round(self._percentile / 100.0 * (len(ordered) - 1)))
+        return ordered[rank]
+
+    def record(self, template, seconds):
+        """
+        Records the latency of a completed request to ``template``.
+        """
+        with self._lock:
+            latencies = self._latencies.get(template)
+            if latencies is None:
+                latencies = self._latencies[template] = deque(
+                    maxlen=self._window)
+            latencies.append(seconds)
+
+    def call(self, template, send, send_hedge=None):
+        """
+        Calls ``send`` and returns its response, calling ``send_hedge`` (or
+        ``send`` again) if it is slower than the delay for ``template`` and
+        the budget allows. The first successful response wins and the other
+        request is cancelled, or its response closed when it arrives. If both
+        requests fail, the first request's exception is raised.
+        """
+        self._earn()
+        delay = self.delay_for(template)
+        if delay is None:
+            return self._timed(template, send)
+
+        primary = self._executor.submit(self._timed, template, send)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._spend():
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, template,
+                                      send_hedge or send)
+        pending = set([primary, hedge])
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        _cancel(loser)
+                    return future.result()
+        return primary.result()
+
+    def shutdown(self):
+        """
+        Stops the threads used to send hedged requests.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _timed(self, template, send):
+        started = self._clock()
+        response = send()
+        self.record(template, self._clock() - started)
+        return response
+
+    def _earn(self):
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._budget)
+
+    def _spend(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedged += 1
+            return True
+
+
+def _cancel(future):
+    if not future.cancel():
+        future.add_done_callback(_close_response)
+
+
+def _close_response(future):
+    if future.exception() is None:
+        close = getattr(future.result(), "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,151 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Fetching long message histories by splitting them into ranges of message
+ids. Message ids increase monotonically, so a feed can be split into
+contiguous id ranges which are paged through independently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .apis.messages import merge_messages
+from .concurrency import DEFAULT_MAX_WORKERS
+from .deadline import bind
+from .models import GenericModel
+
+
+class PartitionedHistory(object):
+    """
+    Downloads a feed's history with several concurrent ``older_than`` cursor
+    walks, one per range of message ids::
+
+        history = PartitionedHistory(yammer.messages, "from_group",
+                                     target_id=123, partitions=8)
+        result = history.fetch()
+
+    The id space between the oldest and newest message is discovered with
+    single-message probes and divided into equal ranges. Each walk starts at
+    the top of its range and stops at the range's lower bound, and the
+    ranges are stitched back together newest first, so no message is missed
+    or returned twice.
+    """
+
+    def __init__(self, messages_api, feed, target_id=None, partitions=4,
+                 older_than=None, newer_than=None, limit=None,
+                 max_workers=DEFAULT_MAX_WORKERS):
+        """
+        * ``feed`` and ``target_id`` -- The feed to fetch, as accepted by
+          :meth:`yampy.apis.MessagesAPI.iter_pages`.
+        * ``partitions`` -- The number of id ranges to fetch concurrently.
+        * ``older_than`` -- Only fetch messages older than this message ID.
+        * ``newer_than`` -- Only fetch messages newer than this message ID.
+          Giving this saves the probes needed to find the oldest message.
+        * ``limit`` -- The number of messages to request per page.
+        """
+        self._messages_api = messages_api
+        self._feed = feed
+        self._target_id = target_id
+        self._partitions = partitions
+        self._older_than = older_than
+        self._newer_than = newer_than
+        self._limit = limit
+        self._max_workers = max_workers
+
+    def ranges(self):
+        """
+        Returns the id ranges that will be walked, newest first, as
+        ``(lowest_id, older_than)`` pairs. Each range holds the messages
+        whose ids are at least ``lowest_id`` and lower than ``older_than``.
+        """
+        newest = self._probe(self._older_than)
+        if newest is None:
+            return []
+        top = newest + 1
+        if self._newer_than is not None:
+            bottom = self._newer_than + 1
+        else:
+            bottom = self._find_oldest_id(top)
+        if bottom >= top:
+            return []
+
+        count = max(1, min(self._partitions, top - bottom))
+        bounds = [top - (top - bottom) * i // count for i in range(count + 1)]
+        return [(bounds[i + 1], bounds[i]) for i in range(count)]
+
+    def iter_pages(self):
+        """
+        Yields pages of messages, newest first, trimmed to their id ranges.
+        The ranges are fetched concurrently; pages from later ranges are held
+        until all earlier ranges have been yielded.
+        """
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        futures = []
+        try:
+            futures = [executor.submit(bind(self._walk), lowest_id, older_than)
+                       for lowest_id, older_than in self.ranges()]
+            for future in futures:
+                for page in future.result():
+                    yield page
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def fetch(self):
+        """
+        Returns the whole history in the same format as the message listing
+        methods.
+        """
+        messages = None
+        for page in self.iter_pages():
+            messages = merge_messages(messages, page)
+        return messages
+
+    def _walk(self, lowest_id, older_than):
+        pages = []
+        for page in self._messages_api.iter_pages(
+                self._feed, self._target_id, older_than=older_than,
+                limit=self._limit):
+            page = GenericModel(page)
+            messages = page.get("messages", [])
+            page["messages"] = [m for m in messages if m["id"] >= lowest_id]
+            pages.append(page)
+            if len(page["messages"]) < len(messages):
+                break
+        return pages
+
+    def _find_oldest_id(self, top):
+        """
+        Binary searches for the lowest ``older_than`` whose probe still
+        returns a message. That message is the oldest in the feed.
+        """
+        low, high = 1, top
+        while low < high:
+            middle = (low + high) // 2
+            if self._probe(middle) is None:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1
+
+    def _probe(self, older_than):
+        message = self._messages_api.newest_message(
+            self._feed, self._target_id, older_than=older_than,
+        )
+        return None if message is None else message["id"]
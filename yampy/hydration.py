@@ -0,0 +1,186 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Resolving the users, groups, threads and messages that messages refer to.
+"""
+
+from collections import OrderedDict
+import threading
+
+from .concurrency import DEFAULT_MAX_WORKERS, run_bulk
+from .errors import NotFoundError
+from .models import GenericModel
+
+
+class EntityCache(object):
+    """
+    A thread-safe cache of API objects keyed by ``(type, id)``, e.g.
+    ``("user", 123)``. When ``max_size`` is given the least recently used
+    entries are evicted first.
+
+    Objects that are known not to exist are cached as None.
+    """
+
+    def __init__(self, max_size=None):
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._entries.pop(key)
+            self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            if self._max_size is not None:
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+
+    def add_references(self, references):
+        """
+        Caches each of the ``references`` of a page of messages.
+        """
+        for reference in references:
+            if "type" in reference and "id" in reference:
+                self.set((reference["type"], reference["id"]), reference)
+
+
+class Hydrator(object):
+    """
+    Attaches the objects that messages refer to, fetching any that are
+    missing from the ``references`` of their pages::
+
+        hydrator = Hydrator(yammer)
+        page = hydrator.hydrate_page(yammer.messages.from_group(123))
+        page.messages[0].resolved.sender.full_name
+
+    All the ids a batch of messages needs are collected first, and only those
+    that are not already cached are fetched, concurrently and at most once.
+    Each message gets a ``resolved`` dict with any of these keys that apply:
+
+    * ``sender`` -- The user who posted the message.
+    * ``replied_to`` -- The message this one replies to.
+    * ``direct_to`` -- The user a direct message was sent to.
+    * ``liked_by`` -- A list of the users that like the message.
+    * ``group`` -- The group the message was posted in.
+    * ``thread`` -- The thread the message belongs to.
+
+    Objects that cannot be found are resolved as None.
+    """
+
+    def __init__(self, yammer, cache=None, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Initializes a new Hydrator that fetches missing objects with the API
+        objects of the given :class:`yampy.Yammer` instance. Pass a shared
+        :class:`EntityCache` as ``cache`` to reuse objects between hydrators.
+        """
+        self._finders = {
+            "user": yammer.users.find,
+            "group": yammer.groups.find,
+            "thread": yammer.threads.find,
+            "message": yammer.messages.find,
+        }
+        self.cache = cache if cache is not None else EntityCache()
+        self._max_workers = max_workers
+
+    def hydrate_page(self, page):
+        """
+        Hydrates the messages of a page returned by one of the message
+        listing methods, after caching its references, and returns the page.
+        Can be registered as a sink with
+        :meth:`yampy.apis.MessagesAPI.add_sink`.
+        """
+        self.cache.add_references(page.get("references", ()))
+        self.hydrate(page.get("messages", ()))
+        return page
+
+    def hydrate(self, messages):
+        """
+        Hydrates each of the given messages in place and returns them.
+        """
+        messages = list(messages)
+        missing = OrderedDict()
+        for message in messages:
+            for key in self._references(message).values():
+                for reference in _as_list(key):
+                    if reference not in self.cache:
+                        missing[reference] = True
+        self._fetch(list(missing))
+
+        for message in messages:
+            resolved = GenericModel()
+            for name, key in self._references(message).items():
+                if isinstance(key, list):
+                    resolved[name] = [self.cache.get(k) for k in key]
+                else:
+                    resolved[name] = self.cache.get(key)
+            message["resolved"] = resolved
+        return messages
+
+    def _fetch(self, keys):
+        if not keys:
+            return
+        report = run_bulk(
+            lambda key: self._finders[key[0]](key[1]),
+            keys,
+            max_workers=self._max_workers,
+            idempotent_errors=(NotFoundError,),
+            key=lambda key: key,
+        )
+        for key, value in report.succeeded.items():
+            if key[0] == "message" and value is not None:
+                value = (value.get("messages") or [value])[0]
+            self.cache.set(key, value)
+
+    def _references(self, message):
+        references = {}
+        if message.get("sender_id") is not None and \
+                message.get("sender_type", "user") == "user":
+            references["sender"] = ("user", message["sender_id"])
+        if message.get("replied_to_id") is not None:
+            references["replied_to"] = ("message", message["replied_to_id"])
+        if message.get("direct_to_id") is not None:
+            references["direct_to"] = ("user", message["direct_to_id"])
+        if message.get("group_id") is not None:
+            references["group"] = ("group", message["group_id"])
+        if message.get("thread_id") is not None:
+            references["thread"] = ("thread", message["thread_id"])
+        liked_by = message.get("liked_by") or {}
+        names = liked_by.get("names") or ()
+        if names:
+            references["liked_by"] = [("user", like["user_id"])
+                                      for like in names]
+        return references
+
+
+def _as_list(key):
+    return key if isinstance(key, list) else [key]
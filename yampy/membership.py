@@ -0,0 +1,191 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+A network-wide index of group memberships for fast access-control checks.
+"""
+
+from array import array
+import json
+
+from .concurrency import DEFAULT_MAX_WORKERS, run_bulk
+from .models import extract_id
+
+
+class MembershipIndex(object):
+    """
+    Bidirectional maps between users and the groups they belong to.
+
+    User and group ids are assigned dense positions. Each group keeps a
+    bitset over user positions, so :meth:`is_member` is a constant time bit
+    test, and each user keeps a compact integer array of group positions for
+    :meth:`groups_of`.
+
+    Build one from the API with :meth:`crawl`, keep it current with
+    :meth:`refresh`, and persist it with :meth:`save` and :meth:`load`.
+    """
+
+    def __init__(self):
+        self._user_ids = []
+        self._user_positions = {}
+        self._group_ids = []
+        self._group_positions = {}
+        self._bitsets = []
+        self._user_groups = []
+
+    @classmethod
+    def crawl(cls, yammer, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Builds an index of every group returned by ``yammer.groups.all()``,
+        paging through the members of several groups concurrently.
+        """
+        index = cls()
+        index.refresh(yammer, max_workers=max_workers)
+        return index
+
+    def refresh(self, yammer, group_ids=None, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Re-fetches the members of the groups identified by ``group_ids``, or
+        of every group in the network if it is None, in which case groups
+        that no longer exist are dropped from the index.
+
+        Returns a :class:`yampy.concurrency.BulkReport` keyed by group id.
+        Groups that could not be fetched keep their previous members.
+        """
+        if group_ids is None:
+            group_ids = [group["id"] for group in yammer.groups.all()]
+            for group_id in set(self._group_positions) - set(group_ids):
+                self.set_members(group_id, ())
+        report = run_bulk(lambda group_id: _fetch_members(yammer, group_id),
+                          [extract_id(group_id) for group_id in group_ids],
+                          max_workers=max_workers)
+        for group_id, user_ids in report.succeeded.items():
+            self.set_members(group_id, user_ids)
+        return report
+
+    def set_members(self, group_id, user_ids):
+        """
+        Replaces the members of the group identified by ``group_id``.
+        """
+        group = self._position(group_id, self._group_ids,
+                               self._group_positions)
+        if group == len(self._bitsets):
+            self._bitsets.append(bytearray())
+        for user in self._iter_bits(self._bitsets[group]):
+            groups = self._user_groups[user]
+            groups.pop(groups.index(group))
+
+        bitset = bytearray((len(self._user_ids) + len(user_ids)) // 8 + 1)
+        for user_id in user_ids:
+            user = self._position(user_id, self._user_ids,
+                                  self._user_positions)
+            if user == len(self._user_groups):
+                self._user_groups.append(array("i"))
+            if not bitset[user >> 3] & (1 << (user & 7)):
+                bitset[user >> 3] |= 1 << (user & 7)
+                self._user_groups[user].append(group)
+        self._bitsets[group] = bitset
+
+    def is_member(self, user_id, group_id):
+        """
+        Returns True if the user identified by ``user_id`` belongs to the
+        group identified by ``group_id``.
+        """
+        user = self._user_positions.get(extract_id(user_id))
+        group = self._group_positions.get(extract_id(group_id))
+        if user is None or group is None:
+            return False
+        bitset = self._bitsets[group]
+        byte = user >> 3
+        return byte < len(bitset) and bool(bitset[byte] & (1 << (user & 7)))
+
+    def groups_of(self, user_id):
+        """
+        Returns the ids of the groups the user identified by ``user_id``
+        belongs to.
+        """
+        user = self._user_positions.get(extract_id(user_id))
+        if user is None:
+            return []
+        return [self._group_ids[group] for group in self._user_groups[user]]
+
+    def members_of(self, group_id):
+        """
+        Returns the ids of the users who belong to the group identified by
+        ``group_id``.
+        """
+        group = self._group_positions.get(extract_id(group_id))
+        if group is None:
+            return []
+        return [self._user_ids[user]
+                for user in self._iter_bits(self._bitsets[group])]
+
+    def group_ids(self):
+        """
+        Returns the ids of the indexed groups that have members.
+        """
+        return [group_id for group_id, bitset
+                in zip(self._group_ids, self._bitsets) if any(bitset)]
+
+    def save(self, path):
+        """
+        Writes the index to the file at ``path``.
+        """
+        with open(path, "w") as index_file:
+            json.dump({
+                "users": self._user_ids,
+                "groups": self._group_ids,
+                "members": [list(self._iter_bits(bitset))
+                            for bitset in self._bitsets],
+            }, index_file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an index written by :meth:`save`.
+        """
+        with open(path) as index_file:
+            data = json.load(index_file)
+        index = cls()
+        for group_id, users in zip(data["groups"], data["members"]):
+            index.set_members(group_id, [data["users"][u] for u in users])
+        return index
+
+    def _position(self, object_id, ids, positions):
+        object_id = extract_id(object_id)
+        position = positions.get(object_id)
+        if position is None:
+            position = len(ids)
+            ids.append(object_id)
+            positions[object_id] = position
+        return position
+
+    def _iter_bits(self, bitset):
+        for byte, bits in enumerate(bitset):
+            while bits:
+                low_bit = bits & -bits
+                yield (byte << 3) + low_bit.bit_length() - 1
+                bits ^= low_bit
+
+
+def _fetch_members(yammer, group_id):
+    user_ids = []
+    for page in yammer.groups.iter_members(group_id):
+        users = page["users"] if isinstance(page, dict) else page
+        user_ids.extend(user["id"] for user in users)
+    return user_ids
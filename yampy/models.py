@@ -15,8 +15,24 @@
 # See the Apache Version 2.0 License for specific language governing
 # permissions and limitations under the License.
 
+from datetime import datetime, timedelta
 import json
 
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+try:
+    text_type = unicode     # Python 2
+except NameError:
+    text_type = str
+
+
+MAX_INTERNED_LENGTH = 64
+MAX_POOL_SIZE = 100000
+MAX_SHAPES = 10000
+
 
 class GenericModel(dict):
     """
@@ -28,12 +44,30 @@ class GenericModel(dict):
     """
 
     @classmethod
-    def from_json(cls, json_string):
+    def from_json(cls, json_string, projection=None, compact=False):
         """
         Parses the given json_string, returning GenericModel instances instead
-        of dicts.
+        of dicts. If a :class:`Projection` is given, the fields it does not
+        keep are discarded before any GenericModel is built.
+
+        With ``compact=True`` the objects inside the outermost one are
+        :class:`CompactModel` instances instead, and keys and short strings
+        are shared with every other compact response, which uses a fraction
+        of the memory for large result sets.
         """
-        return json.loads(json_string, object_hook=cls)
+        if compact:
+            if projection is None:
+                value = json.loads(json_string,
+                                   object_pairs_hook=CompactModel.from_pairs)
+            else:
+                value = projection.apply(json.loads(json_string),
+                                         CompactModel.from_pairs)
+            if isinstance(value, CompactModel):
+                value = cls(value.items())
+            return value
+        if projection is None:
+            return json.loads(json_string, object_hook=cls)
+        return projection.apply(json.loads(json_string), cls)
 
     def __getattr__(self, prop):
         """
@@ -45,6 +79,217 @@ class GenericModel(dict):
             raise AttributeError
 
 
+class StringPool(object):
+    """
+    Shares one copy of each short string between the responses parsed in
+    compact mode, so that keys and repeated values such as ``"message"`` or
+    a network's name are only stored once.
+    """
+
+    def __init__(self, max_length=MAX_INTERNED_LENGTH, max_size=MAX_POOL_SIZE):
+        self._strings = {}
+        self._max_length = max_length
+        self._max_size = max_size
+
+    def intern(self, value):
+        if not isinstance(value, text_type) or len(value) > self._max_length:
+            return value
+        shared = self._strings.get(value)
+        if shared is None:
+            if len(self._strings) >= self._max_size:
+                return value
+            shared = self._strings.setdefault(value, value)
+        return shared
+
+
+class _Shape(object):
+    """
+    The keys of a group of objects, shared by all of them, like the hidden
+    classes of JavaScript engines or CPython's key-sharing dicts.
+    """
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = dict((key, i) for i, key in enumerate(keys))
+
+
+_shapes = {}
+
+
+def _shape_for(keys):
+    shape = _shapes.get(keys)
+    if shape is None:
+        shape = _Shape(keys)
+        if len(_shapes) < MAX_SHAPES:
+            shape = _shapes.setdefault(keys, shape)
+    return shape
+
+
+string_pool = StringPool()
+
+
+class CompactModel(MutableMapping):
+    """
+    A memory efficient alternative to :class:`GenericModel` that is created
+    when parsing in compact mode.
+
+    Objects with the same keys share one table of those keys, and each
+    object only stores a list of its values, instead of a whole hash table.
+    It has the same dict-like and attribute access as GenericModel, but it
+    is not a ``dict``: use ``dict(model)`` to get one, or
+    ``json.dumps(model, default=dict)`` to serialize it.
+    """
+
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        self._shape = _shape_for(tuple(items))
+        self._values = list(items.values())
+
+    @classmethod
+    def from_pairs(cls, pairs, pool=string_pool):
+        """
+        Builds a model from a dict or a list of key/value pairs, sharing its
+        keys and short string values through ``pool``.
+        """
+        if isinstance(pairs, dict):
+            pairs = pairs.items()
+        intern = pool.intern
+        keys = []
+        values = []
+        for key, value in pairs:
+            keys.append(intern(key))
+            if isinstance(value, list):
+                value = [intern(item) for item in value]
+            else:
+                value = intern(value)
+            values.append(value)
+        model = cls.__new__(cls)
+        model._shape = _shape_for(tuple(keys))
+        model._values = values
+        return model
+
+    def __getitem__(self, key):
+        return self._values[self._shape.index[key]]
+
+    def __setitem__(self, key, value):
+        position = self._shape.index.get(key)
+        if position is None:
+            self._shape = _shape_for(self._shape.keys + (key,))
+            self._values.append(value)
+        else:
+            self._values[position] = value
+
+    def __delitem__(self, key):
+        position = self._shape.index[key]
+        keys = self._shape.keys
+        self._shape = _shape_for(keys[:position] + keys[position + 1:])
+        del self._values[position]
+
+    def __iter__(self):
+        return iter(self._shape.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._shape.index
+
+    def __getattr__(self, prop):
+        """
+        Provides access to the members of the model as attributes.
+        """
+        if prop in CompactModel.__slots__:
+            # Not set yet, e.g. while unpickling.
+            raise AttributeError(prop)
+        try:
+            return self._values[self._shape.index[prop]]
+        except KeyError:
+            raise AttributeError(prop)
+
+    def __repr__(self):
+        return "CompactModel(%r)" % dict(self)
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, state):
+        self._shape = _shape_for(tuple(state))
+        self._values = list(state.values())
+
+
+class Projection(object):
+    """
+    A set of dotted field paths to keep from the entities in a response,
+    e.g. ``["sender_id", "body.plain"]``. Every other field is discarded.
+
+    The paths apply to each message or user in a response: to the items of
+    its ``messages`` or ``users`` list when it has one (its other keys, such
+    as ``meta`` and ``references``, are kept as they are), to each item of a
+    list, or else to the response itself. The ``id`` of an entity is always
+    kept.
+    """
+
+    ENVELOPE_KEYS = ("messages", "users")
+
+    def __init__(self, paths):
+        self.paths = tuple(sorted(set(paths) | set(["id"])))
+        self._tree = {}
+        for path in self.paths:
+            node = self._tree
+            for name in path.split("."):
+                node = node.setdefault(name, {})
+
+    def apply(self, value, model=dict):
+        """
+        Returns the parsed JSON ``value`` with the unselected fields removed,
+        and the remaining dicts converted to ``model``.
+        """
+        if isinstance(value, list):
+            return [_project(item, self._tree, model) for item in value]
+        if not isinstance(value, dict):
+            return value
+        envelope_keys = [key for key in self.ENVELOPE_KEYS
+                         if isinstance(value.get(key), list)]
+        if not envelope_keys:
+            return _project(value, self._tree, model)
+        return model(
+            (key, [_project(item, self._tree, model) for item in item_value]
+             if key in envelope_keys else _convert(item_value, model))
+            for key, item_value in value.items()
+        )
+
+
+def _project(value, tree, model):
+    if isinstance(value, list):
+        return [_project(item, tree, model) for item in value]
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    for name, subtree in tree.items():
+        if name in value:
+            item = value[name]
+            if subtree:
+                result[name] = _project(item, subtree, model)
+            else:
+                result[name] = _convert(item, model)
+    return result if model is dict else model(result)
+
+
+def _convert(value, model):
+    # Only the fields that are kept are converted, so the discarded ones
+    # never become models.
+    if model is dict:
+        return value
+    if isinstance(value, dict):
+        return model((key, _convert(item, model))
+                     for key, item in value.items())
+    if isinstance(value, list):
+        return [_convert(item, model) for item in value]
+    return value
+
+
 def extract_id(source):
     """
     Attempts to extract an ID from the argument, first by looking for an
@@ -62,3 +307,28 @@ def extract_id(source):
         pass
 
     return source
+
+
+def parse_timestamp(value):
+    """
+    Parses a timestamp in the format the Yammer API uses, e.g.
+    ``"2019/09/25 14:03:12 +0000"``, returning a naive datetime in UTC.
+    """
+    timestamp = datetime.strptime(value[:19], "%Y/%m/%d %H:%M:%S")
+    offset = value[19:].strip()
+    if offset:
+        sign = -1 if offset[0] == "-" else 1
+        minutes = int(offset[-4:-2]) * 60 + int(offset[-2:])
+        timestamp -= timedelta(minutes=sign * minutes)
+    return timestamp
+
+
+def utc_datetime(value):
+    """
+    Returns the given datetime as a naive datetime in UTC. Naive datetimes
+    are assumed to be in UTC already.
+    """
+    offset = value.utcoffset()
+    if offset is not None:
+        value = value.replace(tzinfo=None) - offset
+    return value
@@ -0,0 +1,135 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Streaming multipart/form-data encoding for message attachments.
+"""
+
+import mimetypes
+import os
+import uuid
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class MultipartEncoder(object):
+    """
+    A file-like object that produces a multipart/form-data body on demand,
+    reading each attachment from disk in chunks instead of buffering the whole
+    request in memory.
+
+    Pass one as the ``files`` argument of :meth:`yampy.client.Client.post` to
+    stream it. :meth:`yampy.apis.MessagesAPI.create` does this when called
+    with ``stream_files=True``.
+    """
+
+    def __init__(self, files, progress=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        * ``files`` -- A dict mapping field names to open binary file objects,
+          file paths or bytes.
+        * ``progress`` -- An optional callable, called with the number of
+          bytes sent so far and the total number of bytes after every chunk.
+        * ``chunk_size`` -- The maximum number of bytes read from a file at a
+          time.
+        """
+        self.boundary = uuid.uuid4().hex
+        self.content_type = "multipart/form-data; boundary=%s" % self.boundary
+        self._progress = progress
+        self._chunk_size = chunk_size
+        self._parts = [self._part(name, value)
+                       for name, value in sorted(files.items())]
+        self._trailer = ("--%s--\r\n" % self.boundary).encode("ascii")
+        self._length = sum(len(header) + size + 2
+                           for header, source, size in self._parts)
+        self._length += len(self._trailer)
+        self._sent = 0
+        self._chunks = self._iter_chunks()
+        self._buffer = b""
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        """
+        Returns up to ``size`` bytes of the body, or the rest of it if
+        ``size`` is negative. Returns an empty string at the end.
+        """
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        if data:
+            self._sent += len(data)
+            if self._progress is not None:
+                self._progress(self._sent, self._length)
+        return data
+
+    def _iter_chunks(self):
+        for header, source, size in self._parts:
+            yield header
+            if isinstance(source, bytes):
+                yield source
+            else:
+                for chunk in self._iter_file(source):
+                    yield chunk
+            yield b"\r\n"
+        yield self._trailer
+
+    def _iter_file(self, source):
+        if isinstance(source, str):
+            with open(source, "rb") as source_file:
+                for chunk in self._iter_file(source_file):
+                    yield chunk
+            return
+        while True:
+            chunk = source.read(self._chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def _part(self, name, value):
+        if isinstance(value, bytes):
+            filename, size = name, len(value)
+        elif isinstance(value, str):
+            filename, size = os.path.basename(value), os.path.getsize(value)
+        else:
+            filename = os.path.basename(getattr(value, "name", name))
+            size = _remaining_size(value)
+        content_type = mimetypes.guess_type(filename)[0] or \
+            "application/octet-stream"
+        header = (
+            "--%s\r\n"
+            "Content-Disposition: form-data; name=\"%s\"; filename=\"%s\"\r\n"
+            "Content-Type: %s\r\n"
+            "\r\n" % (self.boundary, name, filename, content_type)
+        ).encode("utf-8")
+        return (header, value, size)
+
+
+def _remaining_size(file_object):
+    position = file_object.tell()
+    file_object.seek(0, os.SEEK_END)
+    size = file_object.tell() - position
+    file_object.seek(position)
+    return size
@@ -0,0 +1,195 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+An in-memory org chart built from the relationships API.
+"""
+
+from collections import deque
+
+from .concurrency import DEFAULT_MAX_WORKERS, run_bulk
+from .models import extract_id
+
+
+class OrgChart(object):
+    """
+    Superior, subordinate and colleague links between users, crawled from
+    :meth:`yampy.apis.RelationshipsAPI.all` and answered from memory::
+
+        chart = OrgChart.crawl(yammer, [yammer.users.find_current()])
+        chart.chain_of_command(user_id)
+
+    Every link is stored in both directions, so a manager's reports are known
+    even if the manager's own relationships have not been fetched.
+    """
+
+    def __init__(self):
+        self._superiors = {}
+        self._subordinates = {}
+        self._colleagues = {}
+        self._crawled = set()
+
+    @classmethod
+    def crawl(cls, yammer, seed_user_ids, max_depth=None, max_users=None,
+              max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Builds an org chart by breadth-first search from the given users.
+        See :meth:`expand`.
+        """
+        chart = cls()
+        chart.expand(yammer, seed_user_ids, max_depth, max_users, max_workers)
+        return chart
+
+    def expand(self, yammer, seed_user_ids, max_depth=None, max_users=None,
+               max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Fetches the relationships of the given users and, level by level, of
+        every user they link to, fetching each level concurrently. Users
+        whose relationships have already been fetched are skipped.
+
+        * ``max_depth`` -- Stop after this many levels beyond the seeds.
+        * ``max_users`` -- Stop once this many users have been fetched.
+
+        Rate limits are respected by the client's rate limiter, and
+        rate-limited requests are retried with backoff. Returns a dict mapping
+        the ids of users that could not be fetched to the errors raised.
+        """
+        failures = {}
+        frontier = self._uncrawled(extract_id(u) for u in seed_user_ids)
+        depth = 0
+        while frontier and (max_depth is None or depth <= max_depth):
+            if max_users is not None:
+                frontier = frontier[:max(0, max_users - len(self._crawled))]
+            report = run_bulk(yammer.relationships.all, frontier,
+                              max_workers=max_workers)
+            failures.update(report.failed)
+            neighbours = []
+            for user_id in frontier:
+                self._crawled.add(user_id)
+                if user_id in report.succeeded:
+                    neighbours.extend(
+                        self._add_relationships(user_id,
+                                                report.succeeded[user_id]))
+            frontier = self._uncrawled(neighbours)
+            depth += 1
+        return failures
+
+    def superiors(self, user_id):
+        """
+        Returns the ids of the direct superiors of a user.
+        """
+        return sorted(self._superiors.get(extract_id(user_id), ()))
+
+    def subordinates(self, user_id):
+        """
+        Returns the ids of the direct subordinates of a user.
+        """
+        return sorted(self._subordinates.get(extract_id(user_id), ()))
+
+    def colleagues(self, user_id):
+        """
+        Returns the ids of the colleagues of a user.
+        """
+        return sorted(self._colleagues.get(extract_id(user_id), ()))
+
+    def span_of_control(self, user_id):
+        """
+        Returns the number of direct subordinates of a user.
+        """
+        return len(self._subordinates.get(extract_id(user_id), ()))
+
+    def chain_of_command(self, user_id):
+        """
+        Returns the ids of a user's superior, their superior and so on up to
+        the top of the chart, following the lowest superior id where a user
+        has several. Takes time proportional to the user's depth.
+        """
+        chain = []
+        seen = set([extract_id(user_id)])
+        superiors = self._superiors.get(extract_id(user_id))
+        while superiors:
+            superior = min(superiors)
+            if superior in seen:
+                break
+            chain.append(superior)
+            seen.add(superior)
+            superiors = self._superiors.get(superior)
+        return chain
+
+    def ancestors(self, user_id):
+        """
+        Returns the ids of every user above a user, nearest first.
+        """
+        return self._traverse(extract_id(user_id), self._superiors)
+
+    def descendants(self, user_id):
+        """
+        Returns the ids of every user below a user, nearest first.
+        """
+        return self._traverse(extract_id(user_id), self._subordinates)
+
+    def reports_to(self, user_id, manager_id):
+        """
+        Returns True if the user identified by ``manager_id`` is above the
+        user identified by ``user_id``.
+        """
+        return extract_id(manager_id) in self.ancestors(user_id)
+
+    def __contains__(self, user_id):
+        user_id = extract_id(user_id)
+        return user_id in self._crawled or user_id in self._superiors or \
+            user_id in self._subordinates or user_id in self._colleagues
+
+    def _add_relationships(self, user_id, relationships):
+        linked = []
+        for superior in relationships.get("superiors", ()):
+            self._link(superior["id"], user_id)
+            linked.append(superior["id"])
+        for subordinate in relationships.get("subordinates", ()):
+            self._link(user_id, subordinate["id"])
+            linked.append(subordinate["id"])
+        for colleague in relationships.get("colleagues", ()):
+            self._colleagues.setdefault(user_id, set()).add(colleague["id"])
+            self._colleagues.setdefault(colleague["id"], set()).add(user_id)
+            linked.append(colleague["id"])
+        return linked
+
+    def _link(self, superior_id, subordinate_id):
+        self._subordinates.setdefault(superior_id, set()).add(subordinate_id)
+        self._superiors.setdefault(subordinate_id, set()).add(superior_id)
+
+    def _uncrawled(self, user_ids):
+        result = []
+        seen = set()
+        for user_id in user_ids:
+            if user_id not in self._crawled and user_id not in seen:
+                seen.add(user_id)
+                result.append(user_id)
+        return result
+
+    def _traverse(self, user_id, links):
+        result = []
+        seen = set([user_id])
+        queue = deque([user_id])
+        while queue:
+            for linked in sorted(links.get(queue.popleft(), ())):
+                if linked not in seen:
+                    seen.add(linked)
+                    result.append(linked)
+                    queue.append(linked)
+        return result
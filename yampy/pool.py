@@ -0,0 +1,165 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+A pool of :class:`yampy.Yammer` instances for serving many users.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+from .yammer import Yammer
+
+
+DEFAULT_MAX_SIZE = 256
+DEFAULT_IDLE_TIMEOUT = 600
+
+
+class YammerPool(object):
+    """
+    A bounded, thread-safe pool of :class:`yampy.Yammer` instances keyed by
+    access token, for web servers that act on behalf of many users.
+
+    Each tenant keeps its own ``Yammer`` instance, with its own API objects,
+    auth header and rate limiter, but every tenant sends requests through one
+    shared ``requests.Session`` so that connections are reused between
+    requests and between users::
+
+        pool = YammerPool(rate_limiter_factory=lambda: RateLimiter(10))
+
+        def handle(request):
+            yammer = pool.get(request.session["access_token"])
+            return yammer.messages.from_my_feed()
+
+    When the pool is full the least recently used tenant is evicted, and
+    tenants that have not been used for ``idle_timeout`` seconds are dropped.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, base_url=None,
+                 proxies=None, session=None, rate_limiter_factory=None,
+                 clock=time.time):
+        """
+        Initializes a new pool.
+
+        * ``max_size`` -- the maximum number of tenants kept in the pool.
+        * ``idle_timeout`` -- the number of seconds after which an unused
+          tenant expires, or None to keep tenants until they are evicted.
+        * ``base_url`` and ``proxies`` -- passed on to every tenant.
+        * ``session`` -- the ``requests.Session`` shared by every tenant. One
+          is created if it is not given.
+        * ``rate_limiter_factory`` -- an optional callable that returns a new
+          :class:`yampy.concurrency.RateLimiter` for each tenant.
+        """
+        if session is None and requests is not None:
+            session = requests.Session()
+        self._tenants = OrderedDict()
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._base_url = base_url
+        self._proxies = proxies
+        self._session = session
+        self._rate_limiter_factory = rate_limiter_factory
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """
+        Returns the ``requests.Session`` shared by every tenant.
+        """
+        return self._session
+
+    def get(self, access_token):
+        """
+        Returns the :class:`yampy.Yammer` instance for ``access_token``,
+        creating it if it is not in the pool.
+        """
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            entry = self._tenants.pop(access_token, None)
+            if entry is None:
+                entry = [self._create(access_token), now]
+            entry[1] = now
+            self._tenants[access_token] = entry
+            while len(self._tenants) > self._max_size:
+                self._tenants.popitem(last=False)
+            return entry[0]
+
+    def discard(self, access_token):
+        """
+        Removes the tenant for ``access_token``, e.g. after it has been
+        revoked. Does nothing if it is not in the pool.
+        """
+        with self._lock:
+            self._tenants.pop(access_token, None)
+
+    def prune(self):
+        """
+        Removes the tenants that have been idle for longer than the idle
+        timeout. This also happens whenever a tenant is requested.
+        """
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+
+    def clear(self):
+        """
+        Removes every tenant. The shared session is kept open.
+        """
+        with self._lock:
+            self._tenants.clear()
+
+    def close(self):
+        """
+        Removes every tenant and closes the shared session.
+        """
+        self.clear()
+        if self._session is not None:
+            self._session.close()
+
+    def __len__(self):
+        return len(self._tenants)
+
+    def __contains__(self, access_token):
+        return access_token in self._tenants
+
+    def _create(self, access_token):
+        rate_limiter = None
+        if self._rate_limiter_factory is not None:
+            rate_limiter = self._rate_limiter_factory()
+        return Yammer(access_token=access_token, base_url=self._base_url,
+                      proxies=self._proxies, rate_limiter=rate_limiter,
+                      session=self._session)
+
+    def _expire(self, now):
+        if self._idle_timeout is None:
+            return
+        # Tenants are ordered by last use, so the idle ones are at the front.
+        while self._tenants:
+            access_token = next(iter(self._tenants))
+            if now - self._tenants[access_token][1] < self._idle_timeout:
+                break
+            del self._tenants[access_token]
@@ -0,0 +1,129 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Pipelined paging: fetching the next pages of a listing in the background
+while the caller processes the current one.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from .deadline import bind
+
+try:
+    from queue import Queue, Full   # Python 3
+except ImportError:
+    from Queue import Queue, Full   # Python 2
+
+
+DEFAULT_DEPTH = 2
+
+
+def prefetch(iterator, depth=DEFAULT_DEPTH):
+    """
+    Yields the items of ``iterator`` while a background thread keeps up to
+    ``depth`` items fetched ahead. Use it with iterators where each item
+    depends on the previous one, like the ``older_than`` cursor of
+    :meth:`yampy.apis.MessagesAPI.iter_pages`.
+
+    The bounded buffer applies backpressure: the background thread stops
+    fetching while ``depth`` items are waiting. If the caller stops early, the
+    background thread stops after the item it is currently fetching.
+    Exceptions raised by ``iterator`` are re-raised to the caller.
+    """
+    buffer = Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put((True, item)):
+                    return
+            put((False, None))
+        except Exception as e:
+            put((False, e))
+
+    producer = threading.Thread(target=bind(produce))
+    producer.daemon = True
+    producer.start()
+    try:
+        while True:
+            is_item, item = buffer.get()
+            if is_item:
+                yield item
+            elif item is None:
+                return
+            else:
+                raise item
+    finally:
+        stopped.set()
+
+
+def iter_numbered_pages(fetch_page, depth=DEFAULT_DEPTH, first_page=1):
+    """
+    Yields pages from ``fetch_page(number)``, starting at ``first_page``,
+    with the next ``depth`` pages requested concurrently in the background.
+    Use it with page-numbered listings such as
+    :meth:`yampy.apis.UsersAPI.all`.
+
+    Paging stops at the first empty page, or after a page whose
+    ``more_available`` is false. Requests that have not started when the
+    caller stops are cancelled.
+    """
+    fetch_page = bind(fetch_page)
+    executor = ThreadPoolExecutor(max_workers=depth)
+    pending = deque()
+    next_number = [first_page]
+
+    def fill():
+        while len(pending) < depth:
+            pending.append(executor.submit(fetch_page, next_number[0]))
+            next_number[0] += 1
+
+    try:
+        fill()
+        while True:
+            page = pending.popleft().result()
+            if _is_empty(page):
+                return
+            fill()
+            yield page
+            if isinstance(page, dict) and \
+                    page.get("more_available") is False:
+                return
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _is_empty(page):
+    if isinstance(page, dict):
+        return not page.get("users", True)
+    return not page
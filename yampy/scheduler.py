@@ -0,0 +1,185 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Scheduling of requests from different classes of traffic, so that
+interactive requests are not stuck behind batch work.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+import threading
+
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+DEFAULT_MAX_CONCURRENT = 4
+# Batch requests only get the capacity that interactive ones leave unused.
+DEFAULT_WEIGHTS = {INTERACTIVE: 1, BATCH: 0}
+
+_local = threading.local()
+
+
+def current_priority():
+    """
+    Returns the priority class set for the current thread with
+    :func:`priority`, or None.
+    """
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def priority(name):
+    """
+    Returns a context manager that sends the requests made in its block, on
+    the current thread, with the priority class ``name``::
+
+        with priority(BATCH):
+            backfill = yammer.messages.all()
+    """
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(name)
+    try:
+        yield name
+    finally:
+        stack.pop()
+
+
+class RequestScheduler(object):
+    """
+    Limits the number of requests in flight and decides which queued request
+    goes next, using weighted fair queuing between priority classes.
+
+    Each class in ``weights`` gets a share of the request slots in proportion
+    to its weight while other classes are waiting too, and all of them when
+    nothing else is. Classes with a weight of 0 are only served when no
+    weighted class has a request waiting, so they soak up spare capacity
+    without slowing anything else down. Requests made outside a
+    :func:`priority` block use ``default_priority``.
+
+    Pass one to :class:`yampy.client.Client` (or :class:`yampy.Yammer`), and
+    share it between clients that share a rate limit or connection pool::
+
+        scheduler = RequestScheduler(max_concurrent=8)
+        yammer = Yammer(access_token=token, scheduler=scheduler)
+
+        with yammer.priority(BATCH):
+            yammer.messages.all()
+    """
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_CONCURRENT, weights=None,
+                 default_priority=INTERACTIVE):
+        self._max_concurrent = max_concurrent
+        self._weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        if default_priority not in self._weights:
+            raise ValueError("Unknown priority class: %s" % default_priority)
+        self._default_priority = default_priority
+        self._queues = dict((name, deque()) for name in self._weights)
+        self._last_finish = dict((name, 0.0) for name in self._weights)
+        self._virtual_time = 0.0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, priority=None, timeout=None):
+        """
+        Blocks until a request of class ``priority`` may be sent and returns
+        True, or returns False if ``timeout`` seconds pass first.
+        """
+        priority = priority or self._default_priority
+        with self._lock:
+            if priority not in self._weights:
+                raise ValueError("Unknown priority class: %s" % priority)
+            if self._active < self._max_concurrent and not self._waiting():
+                self._active += 1
+                return True
+            ticket = _Ticket(self._finish_tag(priority))
+            self._queues[priority].append(ticket)
+        if ticket.granted.wait(timeout):
+            return True
+        with self._lock:
+            if ticket.granted.is_set():
+                return True
+            self._queues[priority].remove(ticket)
+            return False
+
+    def release(self):
+        """
+        Frees the slot of a request that has completed, handing it to the
+        next queued request.
+        """
+        with self._lock:
+            ticket = self._next_ticket()
+            if ticket is None:
+                self._active -= 1
+            else:
+                ticket.granted.set()
+
+    @contextmanager
+    def slot(self, priority=None):
+        """
+        Returns a context manager that holds a request slot for its block.
+        """
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def queued(self):
+        """
+        Returns a dict that maps each priority class to its number of queued
+        requests.
+        """
+        with self._lock:
+            return dict((name, len(queue))
+                        for name, queue in self._queues.items())
+
+    def _waiting(self):
+        return any(self._queues.values())
+
+    def _finish_tag(self, priority):
+        weight = self._weights[priority]
+        if weight <= 0:
+            return None
+        tag = max(self._virtual_time, self._last_finish[priority]) + \
+            1.0 / weight
+        self._last_finish[priority] = tag
+        return tag
+
+    def _next_ticket(self):
+        weighted = [queue for name, queue in self._queues.items()
+                    if queue and self._weights[name] > 0]
+        if weighted:
+            queue = min(weighted, key=lambda queue: queue[0].finish_tag)
+            ticket = queue.popleft()
+            self._virtual_time = ticket.finish_tag
+            return ticket
+        for name, queue in self._queues.items():
+            if queue:
+                return queue.popleft()
+        return None
+
+
+class _Ticket(object):
+    def __init__(self, finish_tag):
+        self.finish_tag = finish_tag
+        self.granted = threading.Event()
@@ -0,0 +1,254 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+A local full-text search index for mirrored messages.
+"""
+
+import base64
+from collections import defaultdict
+import heapq
+import json
+import math
+import re
+import zlib
+
+from .models import extract_id
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """
+    Splits text into lowercase word tokens.
+    """
+    return [token.lower() for token in TOKEN_PATTERN.findall(text or "")]
+
+
+def encode_positions(positions):
+    """
+    Encodes ascending token positions as varint-encoded gaps.
+    """
+    data = bytearray()
+    previous = 0
+    for position in positions:
+        gap = position - previous
+        previous = position
+        while gap >= 0x80:
+            data.append((gap & 0x7f) | 0x80)
+            gap >>= 7
+        data.append(gap)
+    return bytes(data)
+
+
+def decode_positions(data):
+    """
+    Decodes positions encoded by :func:`encode_positions`.
+    """
+    positions = []
+    position = gap = shift = 0
+    for byte in bytearray(data):
+        gap |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            position += gap
+            positions.append(position)
+            gap = shift = 0
+    return positions
+
+
+class SearchIndex(object):
+    """
+    An inverted index over the plain text bodies of messages, with
+    positional postings and BM25 ranking::
+
+        index = SearchIndex()
+        yammer.messages.add_sink(index.add_page)
+        yammer.messages.all()
+        index.search("quarterly results")
+
+    Each posting holds a term's frequency in a message and its positions as
+    varint-encoded gaps. Messages can be re-added after edits and removed
+    after deletes, and the index can be saved to and loaded from disk.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        """
+        ``k1`` and ``b`` are the BM25 term frequency saturation and length
+        normalization parameters.
+        """
+        self._k1 = k1
+        self._b = b
+        self._postings = defaultdict(dict)
+        self._terms = {}
+        self._lengths = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def __contains__(self, message_id):
+        return extract_id(message_id) in self._lengths
+
+    def add_page(self, page):
+        """
+        Indexes the messages of a page returned by one of the message listing
+        methods. Can be registered with
+        :meth:`yampy.apis.MessagesAPI.add_sink`.
+        """
+        for message in page.get("messages", ()):
+            self.add_message(message)
+
+    def add_message(self, message):
+        """
+        Indexes the ``body.plain`` text of a message, replacing any earlier
+        version of it.
+        """
+        message_id = message["id"]
+        self.remove_message(message_id)
+        body = message.get("body") or {}
+        tokens = tokenize(body.get("plain"))
+        positions = defaultdict(list)
+        for position, token in enumerate(tokens):
+            positions[token].append(position)
+        for token, token_positions in positions.items():
+            self._postings[token][message_id] = (
+                len(token_positions), encode_positions(token_positions),
+            )
+        self._terms[message_id] = tuple(positions)
+        self._lengths[message_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove_message(self, message_id):
+        """
+        Removes a message from the index, e.g. after it has been deleted with
+        :meth:`yampy.apis.MessagesAPI.delete`. Does nothing if the message
+        isn't indexed.
+        """
+        message_id = extract_id(message_id)
+        length = self._lengths.pop(message_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for token in self._terms.pop(message_id):
+            postings = self._postings[token]
+            del postings[message_id]
+            if not postings:
+                del self._postings[token]
+
+    def search(self, query, count=10):
+        """
+        Returns ``(message_id, score)`` pairs for the ``count`` messages that
+        best match the query's terms, best first, ranked with BM25. Terms in
+        double quotes must appear as a phrase.
+        """
+        phrases = re.findall(r'"([^"]*)"', query)
+        terms = tokenize(query)
+        if not terms or not self._lengths:
+            return []
+
+        candidates = None
+        for phrase in phrases:
+            matches = set(self.phrase(phrase))
+            candidates = matches if candidates is None else \
+                candidates & matches
+
+        scores = defaultdict(float)
+        average_length = float(self._total_length) / len(self._lengths)
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (len(self._lengths) - len(postings) + 0.5) /
+                           (len(postings) + 0.5))
+            for message_id, (frequency, _) in postings.items():
+                if candidates is not None and message_id not in candidates:
+                    continue
+                norm = self._k1 * (1 - self._b + self._b *
+                                   self._lengths[message_id] / average_length)
+                scores[message_id] += idf * frequency * (self._k1 + 1) / \
+                    (frequency + norm)
+        return heapq.nlargest(count, scores.items(),
+                              key=lambda pair: (pair[1], pair[0]))
+
+    def phrase(self, text):
+        """
+        Returns the ids of messages that contain the words of ``text`` next
+        to each other and in order.
+        """
+        terms = tokenize(text)
+        if not terms:
+            return []
+        postings = [self._postings.get(term, {}) for term in terms]
+        matches = []
+        for message_id in sorted(min(postings, key=len)):
+            if not all(message_id in p for p in postings):
+                continue
+            starts = set(decode_positions(postings[0][message_id][1]))
+            for offset, term_postings in enumerate(postings[1:], 1):
+                positions = decode_positions(term_postings[message_id][1])
+                starts &= set(p - offset for p in positions)
+            if starts:
+                matches.append(message_id)
+        return matches
+
+    def save(self, path):
+        """
+        Writes the index to the file at ``path`` as compressed JSON.
+        """
+        data = {
+            "k1": self._k1,
+            "b": self._b,
+            "lengths": list(self._lengths.items()),
+            "postings": dict(
+                (token, [[message_id, frequency,
+                          base64.b64encode(positions).decode("ascii")]
+                         for message_id, (frequency, positions)
+                         in postings.items()])
+                for token, postings in self._postings.items()
+            ),
+        }
+        with open(path, "wb") as index_file:
+            index_file.write(zlib.compress(json.dumps(data).encode("utf-8")))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an index written by :meth:`save`.
+        """
+        with open(path, "rb") as index_file:
+            data = json.loads(zlib.decompress(index_file.read())
+                              .decode("utf-8"))
+        index = cls(k1=data["k1"], b=data["b"])
+        index._lengths = dict((message_id, length)
+                              for message_id, length in data["lengths"])
+        index._total_length = sum(index._lengths.values())
+        terms = defaultdict(list)
+        for token, postings in data["postings"].items():
+            for message_id, frequency, positions in postings:
+                index._postings[token][message_id] = (
+                    frequency, base64.b64decode(positions),
+                )
+                terms[message_id].append(token)
+        index._terms = dict((message_id, tuple(tokens))
+                            for message_id, tokens in terms.items())
+        for message_id in index._lengths:
+            index._terms.setdefault(message_id, ())
+        return index
@@ -0,0 +1,177 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Spilling large paged results to disk.
+"""
+
+from array import array
+import json
+import tempfile
+import threading
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+from .models import GenericModel
+
+
+DEFAULT_MAX_MEMORY = 64 * 1024 * 1024
+
+
+class SpilledMessages(Sequence):
+    """
+    A read-only, list-like view of messages stored in a temporary JSON lines
+    file. Messages are parsed when they are indexed or iterated over, so
+    only the ones in use are held in memory.
+
+    The file is deleted when the view is closed or garbage collected.
+    """
+
+    def __init__(self, directory=None):
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._offsets = array("q")
+        self._page_starts = []
+        self._order = None
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def append_page(self, messages):
+        """
+        Writes a page of messages to the file. Pages are presented in the
+        order :func:`yampy.apis.messages.merge_messages` would put them: the
+        last page first.
+        """
+        with self._lock:
+            self._page_starts.append(len(self._offsets))
+            self._file.seek(self._end)
+            for message in messages:
+                line = (json.dumps(message, default=dict) + "\n")
+                data = line.encode("utf-8")
+                self._offsets.append(self._end)
+                self._file.write(data)
+                self._end += len(data)
+            self._order = None
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        with self._lock:
+            offset = self._ordered_offsets()[index]
+            self._file.seek(offset)
+            line = self._file.readline()
+        return GenericModel.from_json(line.decode("utf-8"))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self):
+        """
+        Deletes the temporary file.
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _ordered_offsets(self):
+        if self._order is None:
+            ends = self._page_starts[1:] + [len(self._offsets)]
+            order = array("q")
+            for start, end in reversed(list(zip(self._page_starts, ends))):
+                order.extend(self._offsets[start:end])
+            self._order = order
+        return self._order
+
+
+class SpillingMerger(object):
+    """
+    Merges the pages of a message listing with ``merge`` (see
+    :func:`yampy.apis.messages.merge_messages`), but moves the messages to a
+    :class:`SpilledMessages` file once their size, measured as JSON, exceeds
+    ``max_memory`` bytes.
+    """
+
+    def __init__(self, merge, max_memory=DEFAULT_MAX_MEMORY, directory=None):
+        self._merge = merge
+        self._max_memory = max_memory
+        self._directory = directory
+        self._pages = []
+        self._size = 0
+        self._spilled = None
+        self._references = []
+        self._last_page = None
+
+    @property
+    def spilled(self):
+        return self._spilled is not None
+
+    def add(self, page):
+        """
+        Adds the next page of the listing.
+        """
+        self._last_page = page
+        if self._spilled is not None:
+            self._spilled.append_page(page["messages"])
+            self._references.append(page["references"])
+            return
+        self._pages.append(page)
+        self._size += sum(len(json.dumps(message, default=dict))
+                          for message in page["messages"])
+        if self._size > self._max_memory:
+            self._spill()
+
+    def result(self):
+        """
+        Returns the merged result, or None if no pages were added. Its
+        ``messages`` are a :class:`SpilledMessages` view if they were
+        spilled, or a list otherwise.
+        """
+        if self._last_page is None:
+            return None
+        if self._spilled is None:
+            merged = None
+            for page in self._pages:
+                merged = self._merge(merged, page)
+            return merged
+        result = GenericModel(self._last_page)
+        result["messages"] = self._spilled
+        result["references"] = [reference
+                                for references in reversed(self._references)
+                                for reference in references]
+        return result
+
+    def _spill(self):
+        self._spilled = SpilledMessages(self._directory)
+        for page in self._pages:
+            self._spilled.append_page(page["messages"])
+            self._references.append(page["references"])
+        self._pages = []
@@ -0,0 +1,196 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Reconstruction of reply trees from flat pages of messages.
+"""
+
+from bisect import bisect_left
+
+from .models import extract_id
+
+
+class ReplyNode(object):
+    """
+    A message within a reply tree.
+
+    * ``message`` -- The message itself.
+    * ``parent`` -- The node of the message this one replies to, or None if
+      this is a root (or its parent has not been seen yet).
+    * ``children`` -- Nodes of the direct replies to this message, oldest
+      first.
+    * ``depth`` -- The number of ancestors this node has.
+    * ``descendant_count`` -- The number of replies anywhere below this node.
+    * ``latest_activity`` -- The newest ``created_at`` in this subtree.
+    """
+
+    def __init__(self, message):
+        self.message = message
+        self.parent = None
+        self.children = []
+        self.depth = 0
+        self.descendant_count = 0
+        self.latest_activity = message.get("created_at")
+        self._child_ids = []
+
+    @property
+    def id(self):
+        return self.message["id"]
+
+    @property
+    def child_count(self):
+        """
+        The number of direct replies to this message.
+        """
+        return len(self.children)
+
+    def walk(self):
+        """
+        Yields this node and all nodes below it, depth first.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def _add_child(self, child):
+        position = bisect_left(self._child_ids, child.id)
+        self._child_ids.insert(position, child.id)
+        self.children.insert(position, child)
+        child.parent = self
+
+
+class ThreadBuilder(object):
+    """
+    Builds reply trees from pages of messages, linking each message to the
+    one identified by its ``replied_to_id``.
+
+    Messages can be added in any order and in any number of batches: a reply
+    that arrives before the message it replies to is kept as a provisional
+    root and adopted when its parent turns up. Each message is linked in a
+    single step, so building trees is linear in the number of messages
+    (times the depth of the tree for keeping counts up to date).
+
+    The builder can be registered as a sink with
+    :meth:`yampy.apis.MessagesAPI.add_sink` to merge pages as they are
+    fetched::
+
+        builder = ThreadBuilder()
+        yammer.messages.add_sink(builder.add_page)
+    """
+
+    def __init__(self, messages=()):
+        self._nodes = {}
+        self._orphans = {}
+        self._roots = {}
+        self.add_messages(messages)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, message_id):
+        return extract_id(message_id) in self._nodes
+
+    def add_page(self, page):
+        """
+        Adds the messages of a page returned by one of the message listing
+        methods.
+        """
+        self.add_messages(page.get("messages", ()))
+
+    def add_messages(self, messages):
+        """
+        Adds each of the given messages. Messages that have already been added
+        are replaced, keeping their position in the tree.
+        """
+        for message in messages:
+            existing = self._nodes.get(message["id"])
+            if existing is None:
+                self._add(message)
+            else:
+                existing.message = message
+
+    def node(self, message_id):
+        """
+        Returns the node for the message identified by ``message_id``.
+        """
+        return self._nodes[extract_id(message_id)]
+
+    def thread(self, thread_id):
+        """
+        Returns the root nodes of the thread identified by ``thread_id``,
+        oldest first. A complete thread has a single root; replies whose
+        parents have not been added yet are returned as extra roots.
+        """
+        roots = self._roots.get(extract_id(thread_id), ())
+        return sorted(roots, key=lambda node: node.id)
+
+    def threads(self):
+        """
+        Returns a dict mapping each thread id to its root nodes.
+        """
+        return dict((thread_id, self.thread(thread_id))
+                    for thread_id in self._roots)
+
+    def _add(self, message):
+        node = ReplyNode(message)
+        self._nodes[node.id] = node
+
+        for child in self._orphans.pop(node.id, ()):
+            self._discard_root(child)
+            node._add_child(child)
+            node.descendant_count += child.descendant_count + 1
+            node.latest_activity = _latest(node.latest_activity,
+                                           child.latest_activity)
+
+        parent_id = message.get("replied_to_id")
+        parent = self._nodes.get(parent_id)
+        if parent is None:
+            if parent_id is not None:
+                self._orphans.setdefault(parent_id, []).append(node)
+            self._roots.setdefault(message.get("thread_id"), set()).add(node)
+        else:
+            parent._add_child(node)
+            node.depth = parent.depth + 1
+            ancestor = parent
+            while ancestor is not None:
+                ancestor.descendant_count += node.descendant_count + 1
+                ancestor.latest_activity = _latest(ancestor.latest_activity,
+                                                   node.latest_activity)
+                ancestor = ancestor.parent
+
+        if node.children:
+            for descendant in node.walk():
+                if descendant.parent is not None:
+                    descendant.depth = descendant.parent.depth + 1
+
+    def _discard_root(self, node):
+        thread_id = node.message.get("thread_id")
+        roots = self._roots.get(thread_id)
+        roots.discard(node)
+        if not roots:
+            del self._roots[thread_id]
+
+
+def _latest(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return max(first, second)
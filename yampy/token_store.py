@@ -0,0 +1,79 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Stores for caching access tokens and what is known about them.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class MemoryTokenStore(object):
+    """
+    A thread-safe, in-process token store whose entries expire after a time
+    to live. When ``max_size`` is given the least recently used entries are
+    evicted first.
+
+    :class:`yampy.Authenticator` accepts any object with the same ``get``,
+    ``set`` and ``delete`` methods, e.g. one backed by Redis or memcached so
+    that several processes can share cached tokens. Values are plain dicts,
+    lists, strings and booleans, so they can be serialized as JSON.
+    """
+
+    def __init__(self, max_size=None, clock=time.time):
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the value stored under ``key``, or None if there is none or
+        it has expired.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                return None
+            self._entries[key] = entry
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores ``value`` under ``key`` for ``ttl`` seconds, or until it is
+        evicted if ``ttl`` is None.
+        """
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+            if self._max_size is not None:
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Removes the value stored under ``key``, if any.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
@@ -0,0 +1,173 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+A local inverted index from topics to the messages tagged with them.
+"""
+
+from collections import Counter
+import heapq
+import json
+
+from .models import extract_id
+
+
+class TopicIndex(object):
+    """
+    Maps topic ids to the ids of messages about them, built incrementally
+    from pages of messages as they are fetched, so topic queries don't need
+    to page through :meth:`yampy.apis.MessagesAPI.about_topic` again::
+
+        index = TopicIndex()
+        yammer.messages.add_sink(index.add_page)
+        yammer.messages.all()
+        index.top_topics(10)
+
+    A message's topics are read from its ``topics`` list. Pages fetched with
+    ``about_topic`` can also be added with :meth:`add_messages` and an
+    explicit ``topic_id``. Co-occurrence counts are kept up to date as
+    messages are added, so every query is a dict lookup or a scan of one
+    topic's entries.
+    """
+
+    def __init__(self):
+        self._messages = {}
+        self._topics = {}
+        self._co_occurrences = {}
+        self._names = {}
+
+    def add_page(self, page):
+        """
+        Adds the messages of a page returned by one of the message listing
+        methods, and the names of any topics in its references.
+        """
+        for reference in page.get("references", ()):
+            if reference.get("type") == "topic" and "name" in reference:
+                self._names[reference["id"]] = reference["name"]
+        self.add_messages(page.get("messages", ()))
+
+    def add_messages(self, messages, topic_id=None):
+        """
+        Adds each of the given messages under the topics it lists, and under
+        ``topic_id`` if given.
+        """
+        for message in messages:
+            topic_ids = set(extract_id(t) for t in message.get("topics") or ())
+            if topic_id is not None:
+                topic_ids.add(extract_id(topic_id))
+            for topic in topic_ids:
+                self._tag(message["id"], topic)
+
+    def remove_message(self, message_id):
+        """
+        Removes a message from the index, e.g. after it has been deleted with
+        :meth:`yampy.apis.MessagesAPI.delete`.
+        """
+        message_id = extract_id(message_id)
+        topics = self._topics.pop(message_id, ())
+        for topic in topics:
+            self._messages[topic].discard(message_id)
+            if not self._messages[topic]:
+                del self._messages[topic]
+            counts = self._co_occurrences[topic]
+            for other in topics:
+                if other != topic:
+                    counts[other] -= 1
+                    if not counts[other]:
+                        del counts[other]
+
+    def messages_about(self, topic_id):
+        """
+        Returns the ids of the indexed messages about a topic, newest first.
+        """
+        return sorted(self._messages.get(extract_id(topic_id), ()),
+                      reverse=True)
+
+    def topics_of(self, message_id):
+        """
+        Returns the ids of the topics of an indexed message.
+        """
+        return sorted(self._topics.get(extract_id(message_id), ()))
+
+    def message_count(self, topic_id):
+        """
+        Returns the number of indexed messages about a topic.
+        """
+        return len(self._messages.get(extract_id(topic_id), ()))
+
+    def top_topics(self, count=10):
+        """
+        Returns ``(topic_id, message_count)`` pairs for the ``count`` topics
+        with the most messages, busiest first.
+        """
+        counts = ((topic, len(messages))
+                  for topic, messages in self._messages.items())
+        return heapq.nlargest(count, counts,
+                              key=lambda pair: (pair[1], -pair[0]))
+
+    def co_occurring(self, topic_id, count=10):
+        """
+        Returns ``(topic_id, shared_message_count)`` pairs for the ``count``
+        topics that most often appear on the same messages as a topic.
+        """
+        counts = self._co_occurrences.get(extract_id(topic_id), Counter())
+        return heapq.nlargest(count, counts.items(),
+                              key=lambda pair: (pair[1], -pair[0]))
+
+    def name(self, topic_id):
+        """
+        Returns the name of a topic, if it has appeared in the references of
+        an added page.
+        """
+        return self._names.get(extract_id(topic_id))
+
+    def save(self, path):
+        """
+        Writes the index to the file at ``path``.
+        """
+        with open(path, "w") as index_file:
+            json.dump({
+                "topics": [[message_id, sorted(topics)] for message_id, topics
+                           in self._topics.items()],
+                "names": list(self._names.items()),
+            }, index_file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an index written by :meth:`save`.
+        """
+        with open(path) as index_file:
+            data = json.load(index_file)
+        index = cls()
+        for message_id, topics in data["topics"]:
+            for topic in topics:
+                index._tag(message_id, topic)
+        index._names.update((topic, name) for topic, name in data["names"])
+        return index
+
+    def _tag(self, message_id, topic):
+        topics = self._topics.setdefault(message_id, set())
+        if topic in topics:
+            return
+        counts = self._co_occurrences.setdefault(topic, Counter())
+        for other in topics:
+            counts[other] += 1
+            self._co_occurrences[other][topic] += 1
+        topics.add(topic)
+        self._messages.setdefault(topic, set()).add(message_id)
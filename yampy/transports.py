@@ -0,0 +1,214 @@
+# Copyright (c) Microsoft Corporation
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# THIS CODE IS PROVIDED *AS IS* BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, EITHER EXPRESS OR IMPLIED, INCLUDING WITHOUT LIMITATION ANY
+# IMPLIED WARRANTIES OR CONDITIONS OF TITLE, FITNESS FOR A PARTICULAR
+# PURPOSE, MERCHANTABLITY OR NON-INFRINGEMENT.
+#
+# See the Apache Version 2.0 License for specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Transports that send the HTTP requests made by :class:`yampy.client.Client`.
+
+A transport is any object with a ``send`` method that takes the keyword
+arguments of ``requests.request`` (``method``, ``url``, ``headers``,
+``proxies``, ``params`` and optionally ``files`` or ``data``) and returns an
+object with ``status_code``, ``reason`` and ``text`` attributes. A
+``timeout`` keyword argument, either a number of seconds or a ``(connect,
+read)`` tuple, is passed when one is set.
+"""
+
+try:
+    from urllib.parse import urlencode, urlsplit
+except ImportError:
+    from urllib import urlencode
+    from urlparse import urlsplit
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+from .multipart import MultipartEncoder
+
+
+class TransportResponse(object):
+    """
+    The status, reason and decoded body of a response received by a
+    transport that does not return ``requests`` responses.
+    """
+
+    def __init__(self, status_code, reason, text):
+        self.status_code = status_code
+        self.reason = reason
+        self.text = text
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(object):
+    """
+    Sends requests with the ``requests`` package. This is the default.
+
+    Requests are sent through ``session`` if one is given, so that its
+    connections are kept alive and reused; otherwise each request opens a new
+    connection.
+    """
+
+    def __init__(self, session=None):
+        self.session = session
+
+    def send(self, **kwargs):
+        if self.session is not None:
+            return self.session.request(**kwargs)
+        return requests.request(**kwargs)
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+
+class Urllib3Transport(object):
+    """
+    Sends requests with ``urllib3`` directly, which skips the per-request work
+    that ``requests`` does (building a ``PreparedRequest``, merging session
+    settings, running hooks, and so on). Connections are pooled and reused.
+    """
+
+    def __init__(self, pool_manager=None, **pool_options):
+        """
+        * ``pool_manager`` -- the ``urllib3.PoolManager`` to send requests
+          through. One is created from ``pool_options`` if it is not given.
+        """
+        import urllib3
+        self._urllib3 = urllib3
+        self._pool_options = pool_options
+        self._pool_manager = pool_manager or urllib3.PoolManager(
+            **pool_options)
+        self._proxy_managers = {}
+
+    def send(self, method, url, headers=None, proxies=None, params=None,
+             files=None, data=None, timeout=None):
+        headers = dict(headers or {})
+        body = _body(headers, files, data)
+        options = {}
+        if isinstance(timeout, tuple):
+            options["timeout"] = self._urllib3.Timeout(connect=timeout[0],
+                                                       read=timeout[1])
+        elif timeout is not None:
+            options["timeout"] = timeout
+        if body is not None and hasattr(body, "__len__"):
+            headers["Content-Length"] = str(len(body))
+        response = self._manager_for(url, proxies).request(
+            method.upper(), _url_with_query(url, params), body=body,
+            headers=headers, retries=False, **options
+        )
+        return TransportResponse(
+            response.status, response.reason,
+            response.data.decode("utf-8", "replace"),
+        )
+
+    def close(self):
+        self._pool_manager.clear()
+        for manager in self._proxy_managers.values():
+            manager.clear()
+
+    def _manager_for(self, url, proxies):
+        proxy = (proxies or {}).get(urlsplit(url).scheme)
+        if proxy is None:
+            return self._pool_manager
+        manager = self._proxy_managers.get(proxy)
+        if manager is None:
+            manager = self._proxy_managers[proxy] = \
+                self._urllib3.ProxyManager(proxy, **self._pool_options)
+        return manager
+
+
+class HttpxTransport(object):
+    """
+    Sends requests with ``httpx``, by default over HTTP/2, so that concurrent
+    requests from many threads are multiplexed over one connection. Requires
+    the ``httpx`` package with its ``http2`` extra
+    (``pip install yampy[http2]``).
+
+    Proxies cannot be set per request with ``httpx``, so configure them on the
+    ``httpx.Client`` passed in as ``client`` instead.
+    """
+
+    def __init__(self, client=None, http2=True, **client_options):
+        """
+        * ``client`` -- the ``httpx.Client`` to send requests through. One is
+          created with ``http2`` and ``client_options`` if it is not given.
+        """
+        # httpx is slow to import, so only pay for it when it is used.
+        try:
+            import httpx
+        except ImportError:
+            raise ValueError("The httpx package is required for the httpx "
+                             "transport")
+        self._httpx = httpx
+        self._client = client or httpx.Client(http2=http2, **client_options)
+
+    def send(self, method, url, headers=None, proxies=None, params=None,
+             files=None, data=None, timeout=None):
+        if proxies:
+            raise ValueError("Configure proxies on the httpx.Client instead")
+        headers = dict(headers or {})
+        body = _body(headers, files, data)
+        if body is not None and hasattr(body, "read"):
+            headers["Content-Length"] = str(len(body))
+            body = iter(lambda: body.read(64 * 1024), b"")
+        options = {}
+        if isinstance(timeout, tuple):
+            options["timeout"] = self._httpx.Timeout(timeout[1],
+                                                     connect=timeout[0])
+        elif timeout is not None:
+            options["timeout"] = timeout
+        response = self._client.request(
+            method.upper(), url, headers=headers, params=_query(params),
+            content=body, **options
+        )
+        return TransportResponse(response.status_code, response.reason_phrase,
+                                 response.text)
+
+    def close(self):
+        self._client.close()
+
+
+def _query(params):
+    # Match requests, which leaves out parameters whose value is None,
+    # repeats the key of each item in a list and sends booleans as "True" and
+    # "False".
+    query = []
+    for key, value in sorted((params or {}).items()):
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for value in values:
+            if value is not None:
+                query.append((key, str(value) if isinstance(value, bool)
+                              else value))
+    return query
+
+
+def _url_with_query(url, params):
+    query = urlencode(_query(params))
+    if not query:
+        return url
+    return url + ("&" if "?" in url else "?") + query
+
+
+def _body(headers, files, data):
+    if files:
+        data = MultipartEncoder(files)
+    if isinstance(data, MultipartEncoder):
+        headers["Content-Type"] = data.content_type
+    return data
@@ -18,6 +18,8 @@
 from .apis import (MessagesAPI, ThreadsAPI, TopicsAPI, UsersAPI,
                    GroupsAPI, RelationshipsAPI)
 from .client import Client
+from .deadline import deadline
+from .scheduler import priority
 
 
 class Yammer(object):
@@ -30,7 +32,8 @@ class Yammer(object):
     method returns a ``MessagesAPI`` object.
     """
 
-    def __init__(self, access_token=None, base_url=None, proxies=None):
+    def __init__(self, access_token=None, base_url=None, proxies=None,
+                 **client_options):
         """
         Initialize a new Yammer instance.
 
@@ -39,8 +42,12 @@ class Yammer(object):
         * ``base_url`` defaults to the live Yammer API. Provide a different
           base URL to make requests against some other server, e.g. a fake
           in your application's test suite.
+
+        Any other keyword arguments, e.g. ``rate_limiter``, ``session`` or
+        ``hedging``, are passed on to the :class:`yampy.client.Client`.
         """
-        self._client = Client(access_token=access_token, base_url=base_url, proxies=proxies)
+        self._client = Client(access_token=access_token, base_url=base_url,
+                              proxies=proxies, **client_options)
 
     @property
     def client(self):
@@ -114,6 +121,30 @@ class Yammer(object):
             self._relationships_api = RelationshipsAPI(client=self._client)
         return self._relationships_api
 
+    def deadline(self, seconds):
+        """
+        Returns a context manager that limits every request made in its block
+        to finish within ``seconds`` in total, including retries and page
+        fetches, even those made on background threads by yampy::
+
+            with yammer.deadline(5.0):
+                messages = yammer.messages.all()
+
+        Each request's timeout is shortened to the time that is left. Once it
+        has run out, requests raise :class:`yampy.errors.DeadlineExceededError`
+        and paged listings stop before fetching another page.
+        """
+        return deadline(seconds)
+
+    def priority(self, name):
+        """
+        Returns a context manager that sends the requests made in its block
+        with the priority class ``name``, e.g. ``"batch"`` for backfills that
+        should not hold up interactive requests. It only has an effect when
+        the client has a :class:`yampy.scheduler.RequestScheduler`.
+        """
+        return priority(name)
+
     def current_network(self, include_suspended=None):
         """
         Get details on the networks available to this user